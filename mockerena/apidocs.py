@@ -0,0 +1,56 @@
+"""Swagger documentation, set up on the first request for it
+
+flasgger and the Swagger spec are only needed to serve the API docs, so they're loaded the first time a docs page is
+requested rather than when the application starts. The docs of each route are read from ``swagger/<view name>.yml``.
+
+.. codeauthor:: John Lane <john.lane93@gmail.com>
+
+"""
+
+import os
+from threading import Lock
+from typing import Callable, Iterable
+
+from flask import Flask
+
+DOCS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'swagger')
+DOCS_ROUTE = '/apidocs/'
+DOCS_PREFIXES = ('/apidocs', '/apispec', '/flasgger_static')
+
+
+class LazySwagger:
+    """WSGI middleware setting up Swagger documentation for an application on the first request for it
+
+    Flask doesn't allow adding routes after the first request in debug mode, so debug applications are documented
+    straight away.
+    """
+
+    def __init__(self, app: Flask):
+        self.app = app
+        self.wsgi_app = app.wsgi_app
+        self.swagger = None
+        self._lock = Lock()
+
+        app.config.setdefault('SWAGGER', {}).setdefault('doc_dir', DOCS_DIR)
+
+        if app.debug:
+            self.init_swagger()
+
+    def init_swagger(self):
+        """Adds the Swagger documentation routes to the application, if they haven't been already
+        """
+
+        with self._lock:
+
+            if self.swagger is None:
+                from flasgger import Swagger  # pylint: disable=C0415
+                from mockerena.swagger import TEMPLATE  # pylint: disable=C0415
+
+                self.swagger = Swagger(self.app, template=TEMPLATE)
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
+
+        if self.swagger is None and environ.get('PATH_INFO', '').startswith(DOCS_PREFIXES):
+            self.init_swagger()
+
+        return self.wsgi_app(environ, start_response)
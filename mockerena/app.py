@@ -7,37 +7,50 @@
 
 """
 
+from functools import lru_cache
 import inspect
 import json
 import logging
 import os
 import re
+from threading import local
+from typing import Optional
 
 from bson.objectid import ObjectId
 from cerberus import Validator
 from eve import Eve
 from faker.providers import BaseProvider
-from flasgger import Swagger, swag_from
-from flask import abort, jsonify, request, render_template
+from flask import Response, abort, jsonify, request, render_template
 from healthcheck import HealthCheck, EnvironmentDump
 from pymongo.errors import ServerSelectionTimeoutError
 
 from mockerena import __author__, __email__, __version__
+from mockerena.apidocs import DOCS_ROUTE, LazySwagger
+from mockerena.cache import LRUCache, TTLCache, fingerprint
 from mockerena.errors import ERROR_404, ERROR_422
+from mockerena.fakers import FAKER_POOL, create_faker, release_fakers, seed_fakers
 from mockerena.format import format_output
-from mockerena.generate import fake, generate_data, make_safe
+from mockerena.generate import FUNCTION_CACHE, PLAN_CACHE, POOL_CACHE, generate_chunks, make_safe, page_rows, \
+    split_rows
 from mockerena.models.schema import CUSTOM_SCHEMA
+from mockerena.output_cache import DISK_CACHE, RESPONSE_CACHE, cache_response, cached_response, not_modified, \
+    response_key
+from mockerena.providers import REGEX_CACHE
 from mockerena.settings import DEBUG, DEFAULT_FILE_FORMAT, DEFAULT_INCLUDE_HEAD, DEFAULT_SIZE, \
     DEFAULT_QUOTE_CHARACTER, DEFAULT_EXCLUDE_NULL, DEFAULT_DELIMITER, DEFAULT_KEY_SEPARATOR, \
-    DEFAULT_IS_NESTED, DEFAULT_RESPONSES, ENV, HOST, PORT, SECRET_KEY
-from mockerena.swagger import TEMPLATE
+    DEFAULT_IS_NESTED, DEFAULT_RESPONSES, ENV, HOST, PORT, SCHEMA_CACHE_SIZE, SCHEMA_CACHE_TTL, SECRET_KEY, \
+    VALIDATION_CACHE_SIZE
 
 
 app = Eve(__name__, settings=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'settings.py'))
 envdump = EnvironmentDump(include_python=False, include_process=False)
 health = HealthCheck()
-swagger = Swagger(app, template=TEMPLATE)
+SCHEMA_CACHE = TTLCache(SCHEMA_CACHE_SIZE, SCHEMA_CACHE_TTL)
+VALIDATION_CACHE = LRUCache(VALIDATION_CACHE_SIZE)
+validators = local()
+TYPES_SEED = 0
 app.config.update(ENV=ENV, DEBUG=DEBUG, SECRET_KEY=SECRET_KEY)
+app.wsgi_app = LazySwagger(app)
 
 
 def application_data() -> dict:
@@ -75,6 +88,26 @@ def application_settings() -> dict:
     }
 
 
+def cache_statistics() -> dict:
+    """Returns hit and miss counters for in-process caches
+
+    :return: A map of cache statistics
+    :rtype: dict
+    """
+
+    return {
+        "disk": DISK_CACHE.stats() if DISK_CACHE is not None else None,
+        "functions": FUNCTION_CACHE.stats(),
+        "fakers": FAKER_POOL.stats(),
+        "plans": PLAN_CACHE.stats(),
+        "pools": POOL_CACHE.stats(),
+        "regex": REGEX_CACHE.stats(),
+        "responses": RESPONSE_CACHE.stats(),
+        "schemas": SCHEMA_CACHE.stats(),
+        "validations": VALIDATION_CACHE.stats()
+    }
+
+
 def mongo_available() -> tuple:
     """Return status of mongo connection
 
@@ -92,10 +125,15 @@ def mongo_available() -> tuple:
 def get_provider_types() -> dict:
     """Returns all available generator types
 
+    Examples are generated by a Faker instance of their own with a fixed seed, so they're the same every time.
+
     :return: Mapping of all generator types
     :rtype: dict
     """
 
+    faker = create_faker()
+    faker.seed_instance(TYPES_SEED)
+
     def is_generator(method) -> bool:
         return inspect.ismethod(method) and issubclass(type(method.__self__), BaseProvider)
 
@@ -115,10 +153,40 @@ def get_provider_types() -> dict:
                 }
                 for (key, param) in inspect.signature(gen[1]).parameters.items()
             }
-        } for gen in inspect.getmembers(fake, predicate=is_generator)
+        } for gen in inspect.getmembers(faker, predicate=is_generator)
     }
 
 
+def types_body(types: dict) -> tuple:
+    """Returns the JSON body of generator types and its ETag
+
+    :param dict types: Mapping of generator types
+    :return: JSON body and ETag
+    :rtype: tuple
+    """
+
+    body = json.dumps(types)
+    return body, fingerprint(body)
+
+
+@lru_cache(maxsize=1)
+def provider_type_bodies() -> dict:
+    """Returns the JSON bodies of all generator types and of the types of each module
+
+    The types are only inspected on first use and kept for the life of the process.
+
+    :return: Mapping of module to JSON body and ETag, None being every module
+    :rtype: dict
+    """
+
+    modules = {None: get_provider_types()}
+
+    for name, provider_type in modules[None].items():
+        modules.setdefault(provider_type['module'], {})[name] = provider_type
+
+    return {module: types_body(types) for module, types in modules.items()}
+
+
 def generate_and_format(schema: dict) -> tuple:
     """Generate and return formatted data
 
@@ -139,22 +207,111 @@ def generate_and_format(schema: dict) -> tuple:
 
         return json.dumps(error), 422, {'Content-Type': 'application/json'}
 
+    # Seeded requests always return the same output, so they can be answered from the client's or the server's cache
+    key = response_key(schema)
+    cached = not_modified(key) or cached_response(key)
+
+    if cached is not None:
+        return cached
+
     num_rows = request.args.get('num_rows', schema.get('num_rows', DEFAULT_SIZE))
     size = int(num_rows if str(num_rows).isnumeric() else DEFAULT_SIZE)
+    offset = request.args.get('offset', 0)
+    offset = int(offset if str(offset).isnumeric() else 0)
+    limit = request.args.get('limit')
+    limit = int(limit) if str(limit).isnumeric() else None
 
     try:
-        return format_output(generate_data(schema, size), schema, size)
+        # Generate the first chunk up front so errors in the schema are reported before any output is streamed
+        chunks = generate_chunks(schema, size, offset, limit)
+        mock = next(chunks)
+
+        # Only responses spanning several shards are streamed, smaller ones are sent whole with a Content-Length
+        streamed = len(split_rows(page_rows(size, offset, limit))) > 1
+        return cache_response(key, format_output(mock, schema, chunks if streamed else None))
 
     except (AttributeError, SyntaxError, TypeError, ValueError, ZeroDivisionError) as err:
         abort(400, description=str(err))
 
 
+def find_schema(schema_id: str) -> Optional[dict]:
+    """Returns a stored schema by name or id, from the schema cache if possible
+
+    :param str schema_id: Schema name or id
+    :return: Schema document or None if there's no such schema
+    :rtype: Optional[dict]
+    """
+
+    schema = SCHEMA_CACHE.get(schema_id)
+
+    if schema is None:
+        search = [{'schema': schema_id}]
+
+        if ObjectId.is_valid(schema_id):
+            search.append({'_id': ObjectId(schema_id)})
+
+        schema = app.data.driver.db['schema'].find_one({"$or": search})
+
+        if schema:
+            SCHEMA_CACHE.set(str(schema['_id']), schema)
+            SCHEMA_CACHE.set(schema['schema'], schema)
+
+    return schema
+
+
+def validate_custom_schema(data: dict) -> dict:
+    """Validates a posted schema, skipping validation for schemas that recently passed it
+
+    Validators keep the state of the last validation, so every thread has its own validator.
+
+    :param dict data: Provider integration data schema
+    :return: Validation errors, empty if the schema is valid
+    :rtype: dict
+    """
+
+    key = fingerprint(data)
+
+    if VALIDATION_CACHE.get(key):
+        return {}
+
+    if not hasattr(validators, 'custom_schema'):
+        validators.custom_schema = Validator(CUSTOM_SCHEMA)
+
+    if not validators.custom_schema.validate(data):
+        return validators.custom_schema.errors
+
+    VALIDATION_CACHE.set(key, True)
+    return {}
+
+
+def forget_schema(*documents: dict):
+    """Removes schemas from the schema cache once they're changed or deleted
+
+    :param dict documents: Schema documents or updates (ex. the original document and its updates)
+    """
+
+    for document in documents:
+        for key in ('_id', 'schema'):
+            if document.get(key) is not None:
+                SCHEMA_CACHE.discard(str(document[key]))
+
+
 @app.before_request
 def seed():
-    """Seed Faker random generator
+    """Give the request its own Faker instances and seed their random generators
+    """
+
+    seed_fakers(request.args.get('seed'))
+
+
+@app.teardown_request
+def release_faker(_error: Exception = None):
+    """Return the request's Faker instances to the pool
+
+    :param Exception _error: Exception raised by the request, if any
     """
 
-    fake.seed(request.args.get('seed'))
+    release_fakers()
 
 
 @app.route("/")
@@ -165,10 +322,9 @@ def index() -> tuple:
     :rtype: tuple
     """
 
-    return render_template('index.html')
+    return render_template('index.html', docs_url=request.script_root + DOCS_ROUTE)
 
 
-@swag_from('swagger/generate.yml')
 @app.route("/api/schema/<schema_id>/generate")
 def generate(schema_id: str) -> tuple:
     """Generates sample data from a schema
@@ -178,12 +334,7 @@ def generate(schema_id: str) -> tuple:
     :rtype: tuple
     """
 
-    search = [{'schema': schema_id}]
-
-    if ObjectId.is_valid(schema_id):
-        search.append({'_id': ObjectId(schema_id)})
-
-    schema = app.data.driver.db['schema'].find_one({"$or": search})
+    schema = find_schema(schema_id)
 
     if not schema:
         return json.dumps({"_status": "ERR", "_error": ERROR_404}), 404, {'Content-Type': 'application/json'}
@@ -191,7 +342,6 @@ def generate(schema_id: str) -> tuple:
     return generate_and_format(schema)
 
 
-@swag_from('swagger/custom_schema.yml')
 @app.route("/api/schema/generate", methods=['POST'])
 def custom_schema() -> tuple:
     """Generates sample data for the provided schema
@@ -200,16 +350,16 @@ def custom_schema() -> tuple:
     :rtype: tuple
     """
 
-    validator = Validator(CUSTOM_SCHEMA)
     data = request.get_json()
+    errors = validate_custom_schema(data) if isinstance(data, dict) else None
 
-    if not isinstance(data, dict) or not validator.validate(data):
+    if errors is None or errors:
 
         data_error = {"validation exception": f"'{str(data)}' is not a document, must be a dict"}
 
         error = {
             "_status": "ERR",
-            "_issues": data_error if not isinstance(data, dict) else validator.errors,
+            "_issues": data_error if errors is None else errors,
             "_error": ERROR_422
         }
 
@@ -218,16 +368,20 @@ def custom_schema() -> tuple:
     return generate_and_format(data)
 
 
-@swag_from('swagger/types.yml')
 @app.route("/api/types")
-def get_types() -> tuple:
+def get_types() -> Response:
     """Returns all available generator types
 
     :return: A http response
-    :rtype: tuple
+    :rtype: Response
     """
 
-    return json.dumps(get_provider_types()), 200, {'Content-Type': 'application/json'}
+    module = request.args.get('module')
+    body, etag = provider_type_bodies().get(module) or types_body({})
+
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response.make_conditional(request)
 
 
 @app.errorhandler(400)
@@ -242,9 +396,16 @@ def bad_request(error: Exception) -> tuple:
     return jsonify(_status="ERR", _error={"code": 400, "message": str(error)}), 400
 
 
+# Keep cached schemas up to date with changes made through the API
+app.on_updated_schema += forget_schema
+app.on_replaced_schema += forget_schema
+app.on_deleted_item_schema += forget_schema
+app.on_deleted_resource_schema += SCHEMA_CACHE.clear
+
 # Add environment and health check routes
 envdump.add_section("application", application_data)
 envdump.add_section("settings", application_settings)
+envdump.add_section("cache", cache_statistics)
 health.add_check(mongo_available)
 health.add_section("version", __version__)
 app.add_url_rule("/healthcheck", "healthcheck", view_func=health.run)
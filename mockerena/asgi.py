@@ -0,0 +1,237 @@
+"""ASGI entry point for serving Mockerena from an event loop
+
+Eve, Flask and pymongo are synchronous and Flask's request context is bound to the thread handling the request, so
+each request runs start to finish on one thread of a pool of ``ASYNC_THREADS`` threads. The event loop reads request
+bodies and sends responses, so requests waiting for a free thread don't hold a worker process. Response chunks are
+handed from the thread to the loop at most ``STREAM_WINDOW`` at a time, which bounds memory when a client reads slower
+than data is generated.
+
+At most ``ASYNC_WORKERS`` threads run the application at a time. A thread only holds one of those slots while it
+generates a chunk, not while it waits for its client to read, so slow clients don't hold up other requests.
+
+Serve with any ASGI server, ex. ``uvicorn mockerena.asgi:application``.
+
+.. codeauthor:: John Lane <john.lane93@gmail.com>
+
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import io
+import sys
+from threading import Event, Semaphore
+from typing import Callable
+
+from mockerena.app import app
+from mockerena.settings import ASYNC_THREADS, ASYNC_WORKERS
+
+STREAM_WINDOW = 4
+
+
+def wsgi_environ(scope: dict, body: bytes) -> dict:
+    """Returns the WSGI environ for an ASGI HTTP scope
+
+    :param dict scope: ASGI connection scope
+    :param bytes body: Request body
+    :return: WSGI environ
+    :rtype: dict
+    """
+
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+
+    for name, value in scope.get('headers', []):
+        name, value = name.decode('latin-1').upper().replace('-', '_'), value.decode('latin-1')
+
+        if name == 'CONTENT_TYPE':
+            environ[name] = value
+
+        elif name != 'CONTENT_LENGTH':
+            key = f'HTTP_{name}'
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+
+    return environ
+
+
+async def read_body(receive: Callable) -> bytes:
+    """Reads the whole request body
+
+    :param Callable receive: ASGI receive function
+    :return: Request body
+    :rtype: bytes
+    """
+
+    body = bytearray()
+
+    while True:
+        message = await receive()
+
+        if message['type'] == 'http.disconnect':
+            break
+
+        body.extend(message.get('body', b''))
+
+        if not message.get('more_body', False):
+            break
+
+    return bytes(body)
+
+
+class AsgiApplication:
+    """ASGI application running a WSGI application in a bounded pool of threads
+
+    ``workers`` bounds how many threads run the WSGI application at a time and ``threads`` how many requests are handled
+    at a time, including those waiting for their client to read the response.
+    """
+
+    def __init__(self, wsgi_app: Callable, workers: int = 8, threads: int = ASYNC_THREADS):
+        self.wsgi_app = wsgi_app
+        self.generating = Semaphore(max(workers, 1))
+        self.executor = ThreadPoolExecutor(max_workers=max(threads, workers, 1), thread_name_prefix='mockerena')
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable):
+
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+
+        elif scope['type'] == 'http':
+            await self.http(scope, receive, send)
+
+    async def lifespan(self, receive: Callable, send: Callable):
+        """Handles server startup and shutdown, shutting the thread pool down with the server
+
+        :param Callable receive: ASGI receive function
+        :param Callable send: ASGI send function
+        """
+
+        while True:
+            message = await receive()
+
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def http(self, scope: dict, receive: Callable, send: Callable):
+        """Handles a request, running the WSGI application on a thread and sending its response from the loop
+
+        :param dict scope: ASGI connection scope
+        :param Callable receive: ASGI receive function
+        :param Callable send: ASGI send function
+        """
+
+        loop = asyncio.get_running_loop()
+        messages = asyncio.Queue()
+        window, closed = Semaphore(STREAM_WINDOW), Event()
+        environ = wsgi_environ(scope, await read_body(receive))
+
+        task = loop.run_in_executor(
+            self.executor, self.run, environ, lambda message: loop.call_soon_threadsafe(messages.put_nowait, message),
+            window, closed
+        )
+
+        try:
+            while True:
+                message = await messages.get()
+
+                if isinstance(message, BaseException):
+                    raise message
+
+                await send(message)
+
+                if not message.get('more_body', True):
+                    break
+
+                if message['type'] == 'http.response.body':
+                    window.release()
+
+        finally:
+            closed.set()
+            await task
+
+    def run(self, environ: dict, put: Callable, window: Semaphore, closed: Event):
+        """Runs the WSGI application for a request and passes its response to the loop as ASGI messages
+
+        :param dict environ: WSGI environ
+        :param Callable put: Function queuing a message for the loop
+        :param Semaphore window: Number of body chunks the loop is ready for
+        :param Event closed: Set once the loop stops sending the response (ex. the client disconnected)
+        """
+
+        response, started = {}, []
+
+        def start_response(status: str, headers: list, exc_info: tuple = None):
+            if exc_info and started:
+                raise exc_info[1].with_traceback(exc_info[2])
+
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+
+        def send(body: bytes, more_body: bool):
+            # Applications may call start_response as late as when their first chunk is generated
+            if not started:
+                put({'type': 'http.response.start', 'status': response['status'], 'headers': response['headers']})
+                started.append(True)
+
+            put({'type': 'http.response.body', 'body': body, 'more_body': more_body})
+
+        try:
+            with self.generating:
+                body = self.wsgi_app(environ, start_response)
+
+            try:
+                chunks = iter(body)
+
+                while True:
+
+                    # Only hold a generation slot while generating, not while waiting for the client
+                    with self.generating:
+                        chunk = next(chunks, None)
+
+                    if chunk is None:
+                        break
+
+                    while chunk and not window.acquire(timeout=1):
+                        if closed.is_set():
+                            return
+
+                    if closed.is_set():
+                        return
+
+                    if chunk:
+                        send(chunk, True)
+
+            finally:
+                if hasattr(body, 'close'):
+                    body.close()
+
+            send(b'', False)
+
+        except Exception as err:  # pylint: disable=W0703
+            put(err)
+
+
+application = AsgiApplication(app, ASYNC_WORKERS, ASYNC_THREADS)
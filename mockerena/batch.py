@@ -0,0 +1,262 @@
+"""Batch column generation for common providers
+
+Each batch provider mirrors the argument semantics of the Faker/Mockerena provider of the same name, but produces an
+entire column at once, mostly from a seeded NumPy generator. Arguments a batch provider does not cover fall back to
+the per-row provider.
+
+.. codeauthor:: John Lane <john.lane93@gmail.com>
+
+"""
+
+import random
+import sys
+from typing import Callable, Mapping, Optional
+
+import numpy as np
+from mockerena.providers import generate_regex
+
+ALIAS_THRESHOLD = 256
+INT64_MAX = np.iinfo(np.int64).max
+POWERS_OF_TEN = np.power(10, np.arange(1, 19, dtype=np.int64))
+
+
+def numpy_generator(source: random.Random) -> np.random.Generator:
+    """Returns a NumPy generator seeded from a Python random instance
+
+    :param random.Random source: Seeded random instance (ex. Faker's random)
+    :return: NumPy random generator
+    :rtype: np.random.Generator
+    """
+
+    return np.random.default_rng(source.getrandbits(128))
+
+
+def _no_arguments(generate: Callable) -> Callable:
+    """Returns a batch provider factory for providers that take no arguments
+
+    :param Callable generate: Function taking a NumPy generator and size
+    :return: Batch provider factory
+    :rtype: Callable
+    """
+
+    return lambda kwargs: None if kwargs else generate
+
+
+def _random_int(kwargs: Mapping) -> Optional[Callable]:
+    """Batch version of Faker's random_int
+
+    :param Mapping kwargs: Provider keyword arguments
+    :return: Batch provider or None if arguments aren't supported
+    :rtype: Optional[Callable]
+    """
+
+    lower, upper, step = kwargs.get('min', 0), kwargs.get('max', 9999), kwargs.get('step', 1)
+
+    if set(kwargs) - {'min', 'max', 'step'} or not all(isinstance(arg, int) for arg in (lower, upper, step)):
+        return None
+
+    count = len(range(lower, upper + 1, step)) if step else 0
+
+    if not count or max(abs(lower), abs(upper)) >= INT64_MAX:
+        return None
+
+    return lambda rng, size: (lower + step * rng.integers(0, count, size)).tolist()
+
+
+def _pyfloat(kwargs: Mapping) -> Optional[Callable]:
+    """Batch version of Faker's pyfloat
+
+    :param Mapping kwargs: Provider keyword arguments
+    :return: Batch provider or None if arguments aren't supported
+    :rtype: Optional[Callable]
+    """
+
+    left_digits, right_digits = kwargs.get('left_digits'), kwargs.get('right_digits')
+    min_value, max_value = kwargs.get('min_value'), kwargs.get('max_value')
+    positive = bool(kwargs.get('positive', False))
+    dig = sys.float_info.dig
+
+    if set(kwargs) - {'left_digits', 'right_digits', 'positive', 'min_value', 'max_value'}:
+        return None
+
+    if not all(arg is None or isinstance(arg, int) for arg in (left_digits, right_digits, min_value, max_value)):
+        return None
+
+    # Invalid arguments are left to the per-row provider to raise the appropriate error
+    digits = (left_digits, right_digits)
+
+    if left_digits == right_digits == 0 or not all(arg is None or 0 <= arg <= dig for arg in digits):
+        return None
+
+    bounded = min_value is not None or max_value is not None
+    lower = min_value + 1 if min_value is not None and min_value < 0 else min_value
+    upper = max_value + 1 if max_value is not None and max_value < 0 else max_value
+
+    if lower is not None and upper is not None and lower >= upper:
+        return None
+
+    # Make sure whole and fractional parts fit into a 64 bit integer
+    whole_digits = [left_digits] if left_digits is not None else range(1, dig + 1)
+    fraction_digits = [right_digits if right_digits is not None else dig - left for left in whole_digits]
+
+    if bounded:
+        largest = (max(abs(lower or 0), abs(upper or 0)) + 10000) * 10 ** max(fraction_digits)
+    else:
+        largest = max(10 ** (left + right) for left, right in zip(whole_digits, fraction_digits))
+
+    if largest >= INT64_MAX:
+        return None
+
+    def generate(rng: np.random.Generator, size: int) -> list:
+
+        lefts = np.full(size, left_digits) if left_digits is not None else rng.integers(1, dig + 1, size)
+        rights = np.full(size, right_digits) if right_digits is not None else rng.integers(0, dig - lefts + 1)
+
+        if bounded:
+            low = np.full(size, lower) if lower is not None else upper - rng.integers(1, 10000, size)
+            high = np.full(size, upper) if upper is not None else lower + rng.integers(1, 10000, size)
+            whole = rng.integers(low, high)
+            negative = whole < 0
+
+        else:
+            whole = rng.integers(0, np.power(10, lefts))
+            negative = np.zeros(size, dtype=bool) if positive else rng.integers(0, 2, size).astype(bool)
+
+        # Faker concatenates the digits as strings, so the fraction is scaled by its own length
+        fraction = rng.integers(0, np.power(10, rights))
+        scale = np.power(10, np.searchsorted(POWERS_OF_TEN, fraction, side='right') + 1)
+        value = (np.abs(whole) * scale + fraction) / scale
+
+        return np.where(negative, -value, value).tolist()
+
+    return generate
+
+
+def _price(kwargs: Mapping) -> Optional[Callable]:
+    """Batch version of MockProvider.price
+
+    :param Mapping kwargs: Provider keyword arguments
+    :return: Batch provider or None if arguments aren't supported
+    :rtype: Optional[Callable]
+    """
+
+    if set(kwargs) - {'minimum', 'maximum'}:
+        return None
+
+    minimum, maximum = kwargs.get('minimum', 0), kwargs.get('maximum', 999999)
+    minimum = minimum if isinstance(minimum, (int, float)) else 0
+    maximum = maximum if isinstance(maximum, (int, float)) else 999999
+
+    # random.uniform accepts the bounds in either order, NumPy doesn't
+    lower, upper = min(minimum, maximum), max(minimum, maximum)
+    return lambda rng, size: (np.rint(rng.uniform(lower, upper, size) * 100) / 100).tolist()
+
+
+def _regex(kwargs: Mapping) -> Optional[Callable]:
+    """Batch version of MockProvider.regex
+
+    :param Mapping kwargs: Provider keyword arguments
+    :return: Batch provider or None if arguments aren't supported
+    :rtype: Optional[Callable]
+    """
+
+    if set(kwargs) - {'expression'}:
+        return None
+
+    expression = kwargs.get('expression', '')
+    return lambda rng, size: generate_regex(expression, size, random.Random(int(rng.integers(INT64_MAX))))
+
+
+def alias_table(weights: list) -> tuple:
+    """Builds a Walker/Vose alias table for constant time weighted sampling
+
+    :param list weights: Non-negative weights with a positive total
+    :return: Tuple of acceptance probabilities and alias indexes
+    :rtype: tuple
+    """
+
+    count = len(weights)
+    scaled = [weight * count / sum(weights) for weight in weights]
+    probability, alias = [1.0] * count, list(range(count))
+    small = [index for index, weight in enumerate(scaled) if weight < 1]
+    large = [index for index, weight in enumerate(scaled) if weight >= 1]
+
+    while small and large:
+        less, more = small.pop(), large.pop()
+        probability[less], alias[less] = scaled[less], more
+        scaled[more] -= 1 - scaled[less]
+        (small if scaled[more] < 1 else large).append(more)
+
+    return np.array(probability), np.array(alias, dtype=np.int64)
+
+
+def _weighted_choice(kwargs: Mapping) -> Optional[Callable]:
+    """Batch version of MockProvider.weighted_choice
+
+    The weights are validated and turned into a cumulative distribution once per column. Lists longer than
+    ALIAS_THRESHOLD use an alias table instead so each draw is constant time.
+
+    :param Mapping kwargs: Provider keyword arguments
+    :return: Batch provider or None if arguments aren't supported
+    :rtype: Optional[Callable]
+    """
+
+    elements, weights = kwargs.get('elements'), kwargs.get('weights')
+    elements = ['a', 'b', 'c'] if elements is None else elements
+    weights = [1, 2, 3] if weights is None else weights
+
+    # Invalid arguments are left to the per-row provider to raise the appropriate error
+    if set(kwargs) - {'elements', 'weights'} or not all(isinstance(arg, (list, tuple)) for arg in (elements, weights)):
+        return None
+
+    if not (elements and weights):
+        return lambda rng, size: [None] * size
+
+    if len(elements) != len(weights) or not all(isinstance(weight, (int, float)) for weight in weights):
+        return None
+
+    if min(weights) < 0 or not sum(weights) > 0:
+        return None
+
+    elements = list(elements)
+
+    if len(elements) > ALIAS_THRESHOLD:
+        probability, alias = alias_table(weights)
+
+        def generate(rng: np.random.Generator, size: int) -> list:
+            index = rng.integers(0, len(elements), size)
+            index = np.where(rng.random(size) < probability[index], index, alias[index])
+            return [elements[i] for i in index.tolist()]
+
+    else:
+        cumulative = np.cumsum(weights, dtype=float)
+
+        def generate(rng: np.random.Generator, size: int) -> list:
+            index = np.searchsorted(cumulative[:-1], rng.random(size) * cumulative[-1], side='right')
+            return [elements[i] for i in index.tolist()]
+
+    return generate
+
+
+BATCH_PROVIDERS = {
+    'price': _price,
+    'pybool': _no_arguments(lambda rng, size: rng.integers(0, 2, size).astype(bool).tolist()),
+    'pyfloat': _pyfloat,
+    'random_digit': _no_arguments(lambda rng, size: rng.integers(0, 10, size).tolist()),
+    'random_int': _random_int,
+    'regex': _regex,
+    'weighted_choice': _weighted_choice
+}
+
+
+def batch_provider(data_type: str, kwargs: Mapping) -> Optional[Callable]:
+    """Returns a batch provider for a column type if its arguments are supported
+
+    :param str data_type: Provider type
+    :param Mapping kwargs: Provider keyword arguments
+    :return: Function taking a NumPy generator and size, or None
+    :rtype: Optional[Callable]
+    """
+
+    factory = BATCH_PROVIDERS.get(data_type)
+    return factory(kwargs) if factory else None
@@ -0,0 +1,409 @@
+"""Caching helpers for Mockerena
+
+.. codeauthor:: John Lane <john.lane93@gmail.com>
+
+"""
+
+from collections import OrderedDict
+from glob import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from threading import RLock, get_ident
+from typing import Any, Hashable, Mapping, Optional
+
+
+def fingerprint(data: Any) -> str:
+    """Returns a stable hash for JSON-like data
+
+    :param Any data: JSON-like data (dict, list, str, etc.)
+    :return: Hex digest unique to the data's content
+    :rtype: str
+    """
+
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def sizeof(value: Any) -> int:
+    """Returns the approximate memory used by a value, including the items of containers
+
+    :param Any value: Value
+    :return: Size in bytes
+    :rtype: int
+    """
+
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(key) + sizeof(item) for key, item in value.items())
+
+    if isinstance(value, (list, set, tuple)):
+        return sys.getsizeof(value) + sum(sizeof(item) for item in value)
+
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe least recently used cache that keeps track of hits and misses
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = RLock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns a cached value and marks it as recently used
+
+        :param Hashable key: Cache key
+        :param Any default: Value returned on a miss
+        :return: Cached value
+        :rtype: Any
+        """
+
+        with self._lock:
+
+            if key not in self._data:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any):
+        """Caches a value, evicting the least recently used entries when full
+
+        :param Hashable key: Cache key
+        :param Any value: Value to cache
+        """
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+            while len(self._data) > max(self.maxsize, 0):
+                self._data.popitem(last=False)
+
+    def discard(self, key: Hashable):
+        """Removes a value if it's cached
+
+        :param Hashable key: Cache key
+        """
+
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove all entries and reset counters
+        """
+
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Returns cache statistics
+
+        :return: Mapping of cache statistics
+        :rtype: dict
+        """
+
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+
+class SizedLRUCache(LRUCache):
+    """Least recently used cache limited by the total size of its values in bytes rather than by number of entries
+    """
+
+    def __init__(self, maxbytes: int):
+        super().__init__()
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self._sizes = {}
+
+    def set(self, key: Hashable, value: Any, nbytes: int = None):
+        """Caches a value, evicting the least recently used entries until the cache fits its budget
+
+        Values larger than the whole budget aren't cached.
+
+        :param Hashable key: Cache key
+        :param Any value: Value to cache
+        :param int nbytes: Size of the value in bytes, estimated if not provided
+        """
+
+        nbytes = sizeof(value) if nbytes is None else nbytes
+
+        with self._lock:
+            self.nbytes -= self._sizes.pop(key, 0)
+            self._data.pop(key, None)
+
+            if nbytes > self.maxbytes:
+                return
+
+            self._data[key] = value
+            self._sizes[key] = nbytes
+            self.nbytes += nbytes
+
+            while self.nbytes > self.maxbytes:
+                oldest, _ = self._data.popitem(last=False)
+                self.nbytes -= self._sizes.pop(oldest)
+
+    def discard(self, key: Hashable):
+        """Removes a value if it's cached
+
+        :param Hashable key: Cache key
+        """
+
+        with self._lock:
+            super().discard(key)
+            self.nbytes -= self._sizes.pop(key, 0)
+
+    def clear(self):
+        """Remove all entries and reset counters
+        """
+
+        with self._lock:
+            super().clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict:
+        """Returns cache statistics
+
+        :return: Mapping of cache statistics
+        :rtype: dict
+        """
+
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "bytes": self.nbytes,
+                "maxbytes": self.maxbytes}
+
+
+class TTLCache(LRUCache):
+    """Least recently used cache whose values expire ``ttl`` seconds after they're cached
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60):
+        super().__init__(maxsize)
+        self.ttl = ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns a cached value that hasn't expired and marks it as recently used
+
+        :param Hashable key: Cache key
+        :param Any default: Value returned on a miss
+        :return: Cached value
+        :rtype: Any
+        """
+
+        with self._lock:
+            expires, value = self._data.get(key, (0, default))
+
+            if expires <= time.monotonic():
+                self._data.pop(key, None)
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Caches a value until it expires, evicting the least recently used entries when full
+
+        :param Hashable key: Cache key
+        :param Any value: Value to cache
+        """
+
+        super().set(key, (time.monotonic() + self.ttl, value))
+
+    def stats(self) -> dict:
+        """Returns cache statistics
+
+        :return: Mapping of cache statistics
+        :rtype: dict
+        """
+
+        return dict(super().stats(), ttl=self.ttl)
+
+
+class DiskLRUCache:
+    """Thread-safe least recently used cache of files in a directory, limited by their total size in bytes
+
+    Every entry is a metadata file (``<key>.json``) listing the entry's data files by suffix (ex. ``<key>.gz``). Entries
+    already in the directory are loaded on start up, so processes sharing the directory share its entries. Files
+    removed by another process are treated as misses.
+    """
+
+    def __init__(self, directory: str, maxbytes: int):
+        self.directory = directory
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = RLock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self):
+        """Loads the entries already in the directory, least recently used first
+        """
+
+        for path in sorted(glob(self.path('*', '.json')), key=lambda name: os.stat(name).st_mtime):
+
+            try:
+                with open(path) as file:
+                    metadata = json.load(file)
+            except (OSError, ValueError):
+                continue
+
+            self._entries[os.path.basename(path)[:-len('.json')]] = metadata
+            self.nbytes += sum(metadata['files'].values())
+
+        self._evict()
+
+    def path(self, key: str, suffix: str = '') -> str:
+        """Returns the path of an entry's file
+
+        :param str key: Cache key
+        :param str suffix: File suffix
+        :return: File path
+        :rtype: str
+        """
+
+        return os.path.join(self.directory, f'{key}{suffix}')
+
+    def temp_path(self, key: str, suffix: str = '') -> str:
+        """Returns a path to write an entry's file to before it's added to the cache
+
+        :param str key: Cache key
+        :param str suffix: File suffix
+        :return: File path unique to the process and thread
+        :rtype: str
+        """
+
+        return self.path(key, f'{suffix}.{os.getpid()}.{get_ident()}.tmp')
+
+    def get(self, key: str) -> Optional[dict]:
+        """Returns an entry's metadata and marks it as recently used
+
+        :param str key: Cache key
+        :return: Entry metadata, with the size of each file under "files"
+        :rtype: Optional[dict]
+        """
+
+        with self._lock:
+
+            if key not in self._entries:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            metadata = self._entries[key]
+
+        try:
+            os.utime(self.path(key, '.json'))
+        except FileNotFoundError:
+            self.discard(key)
+            return None
+
+        return metadata
+
+    def set(self, key: str, metadata: dict, files: Mapping[str, str]):
+        """Adds an entry, moving its files into the cache and evicting the least recently used entries until the cache
+        fits its budget
+
+        Entries larger than the whole budget aren't cached.
+
+        :param str key: Cache key
+        :param dict metadata: JSON serializable entry metadata
+        :param Mapping[str, str] files: Paths of the entry's files by suffix, usually from ``temp_path``
+        """
+
+        metadata = dict(metadata, files={suffix: os.path.getsize(path) for suffix, path in files.items()})
+        nbytes = sum(metadata['files'].values())
+
+        if nbytes > self.maxbytes:
+            for path in files.values():
+                os.remove(path)
+            return
+
+        for suffix, path in files.items():
+            os.replace(path, self.path(key, suffix))
+
+        with open(self.temp_path(key, '.json'), 'w') as file:
+            json.dump(metadata, file)
+
+        os.replace(self.temp_path(key, '.json'), self.path(key, '.json'))
+
+        with self._lock:
+            self.nbytes += nbytes - sum(self._entries.pop(key, {'files': {}})['files'].values())
+            self._entries[key] = metadata
+            self._evict()
+
+    def discard(self, key: str):
+        """Removes an entry and its files
+
+        :param str key: Cache key
+        """
+
+        with self._lock:
+
+            if key not in self._entries:
+                return
+
+            metadata = self._entries.pop(key)
+            self.nbytes -= sum(metadata['files'].values())
+
+        for suffix in ['.json'] + list(metadata['files']):
+            try:
+                os.remove(self.path(key, suffix))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self):
+        """Removes the least recently used entries until the cache fits its budget
+        """
+
+        with self._lock:
+            while self.nbytes > self.maxbytes and self._entries:
+                self.discard(next(iter(self._entries)))
+
+    def clear(self):
+        """Remove all entries and reset counters
+        """
+
+        with self._lock:
+            for key in list(self._entries):
+                self.discard(key)
+
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Returns cache statistics
+
+        :return: Mapping of cache statistics
+        :rtype: dict
+        """
+
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "bytes": self.nbytes,
+                "maxbytes": self.maxbytes}
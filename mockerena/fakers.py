@@ -0,0 +1,184 @@
+"""Reusable Faker instances, so every request has its own random state
+
+Building a Faker instance imports and wires up every provider for its locale, so instances are kept in a pool per
+locale and handed out to requests as needed. A request checks out at most one instance per locale, seeded with the
+request's seed, and returns them to the pool once it's done.
+
+.. codeauthor:: John Lane <john.lane93@gmail.com>
+
+"""
+
+from contextlib import contextmanager
+from functools import lru_cache
+from threading import Lock
+from typing import Iterator
+
+from faker import Faker
+from faker.generator import Generator
+from flask import g, has_app_context
+
+from mockerena.providers import MockProvider
+from mockerena.settings import FAKER_POOL_SIZE
+
+fake = Faker()
+fake.add_provider(MockProvider)
+
+
+def create_faker(locale: str = None) -> Generator:
+    """Returns a new Faker instance with Mockerena's providers and its own random instance
+
+    :param str locale: Faker locale (ex. en_US), None being Faker's default locale
+    :return: Faker instance
+    :rtype: Generator
+    :raises: AttributeError
+    """
+
+    faker = Faker(locale)
+    faker.add_provider(MockProvider)
+    faker.seed_instance()
+    return faker
+
+
+@contextmanager
+def reseeded(faker: Generator, seed: int = None) -> Iterator[Generator]:
+    """Seeds a Faker instance for the duration of a block, restoring its random state afterwards
+
+    Data seeded from a position in the data set (ex. a block of rows) then doesn't change the state other draws from the
+    request's Faker instance see, wherever that data was generated.
+
+    :param Generator faker: Faker instance
+    :param int seed: Seed, None to only restore the random state afterwards
+    :return: The Faker instance
+    :rtype: Iterator[Generator]
+    """
+
+    state = faker.random.getstate()
+
+    try:
+        if seed is not None:
+            faker.random.seed(seed)
+
+        yield faker
+
+    finally:
+        faker.random.setstate(state)
+
+
+@lru_cache(maxsize=None)
+def local_faker(locale: str = None) -> Generator:
+    """Returns the process-wide Faker instance for a locale, used outside of requests (ex. in worker processes)
+
+    :param str locale: Faker locale, None being Faker's default locale
+    :return: Faker instance
+    :rtype: Generator
+    :raises: AttributeError
+    """
+
+    return fake if locale is None else create_faker(locale)
+
+
+class FakerPool:
+    """Thread-safe pool of idle Faker instances by locale
+
+    Instances are created on demand when there are no idle instances for a locale and at most ``maxsize`` idle
+    instances are kept per locale.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self.created = 0
+        self._idle = {}
+        self._lock = Lock()
+
+    def acquire(self, locale: str = None) -> Generator:
+        """Returns an idle Faker instance for a locale, creating one if there are none
+
+        :param str locale: Faker locale, None being Faker's default locale
+        :return: Faker instance
+        :rtype: Generator
+        :raises: AttributeError
+        """
+
+        with self._lock:
+
+            if self._idle.get(locale):
+                return self._idle[locale].pop()
+
+        faker = create_faker(locale)
+
+        with self._lock:
+            self.created += 1
+
+        return faker
+
+    def release(self, faker: Generator, locale: str = None):
+        """Returns a Faker instance to the pool
+
+        :param Generator faker: Faker instance
+        :param str locale: Locale the instance was acquired for
+        """
+
+        with self._lock:
+            idle = self._idle.setdefault(locale, [])
+
+            if len(idle) < self.maxsize:
+                idle.append(faker)
+
+    def stats(self) -> dict:
+        """Returns pool statistics
+
+        :return: Mapping of pool statistics
+        :rtype: dict
+        """
+
+        return {
+            "created": self.created,
+            "idle": {str(locale or 'default'): len(idle) for locale, idle in self._idle.items()},
+            "maxsize": self.maxsize
+        }
+
+
+FAKER_POOL = FakerPool(FAKER_POOL_SIZE)
+
+
+def seed_fakers(seed: str = None):
+    """Seeds the current request's Faker instances, which are checked out of the pool as they're used
+
+    :param str seed: Seed for the request, None for a random seed
+    """
+
+    g.faker_seed = seed
+
+    # Application contexts can be shared by several requests (ex. when a test client preserves them)
+    g.fakers = g.get('fakers', {})
+
+    for faker in g.fakers.values():
+        faker.seed_instance(seed)
+
+
+def current_faker(locale: str = None) -> Generator:
+    """Returns the current request's Faker instance for a locale
+
+    Outside of a request the process-wide instance for the locale is used instead.
+
+    :param str locale: Faker locale, None being Faker's default locale
+    :return: Faker instance
+    :rtype: Generator
+    :raises: AttributeError
+    """
+
+    if not (has_app_context() and 'fakers' in g):
+        return local_faker(locale)
+
+    if locale not in g.fakers:
+        g.fakers[locale] = FAKER_POOL.acquire(locale).seed_instance(g.faker_seed)
+
+    return g.fakers[locale]
+
+
+def release_fakers():
+    """Returns the current request's Faker instances to the pool
+    """
+
+    for locale, faker in g.pop('fakers', {}).items():
+        FAKER_POOL.release(faker, locale)
@@ -7,19 +7,21 @@
 
 import datetime
 from functools import reduce
-import random
-from typing import Any
+from itertools import chain
+from typing import Any, Callable, Iterable, Iterator
 
-from flask import make_response, request
+from flask import Response, make_response, request, stream_with_context
 from jinja2 import Template
-import pandas as pd
 import simplejson
 
 from mockerena.errors import ERROR_422
-from mockerena.generate import fake
-from mockerena.settings import DEFAULT_FILE_FORMAT, DEFAULT_INCLUDE_HEAD, DEFAULT_SIZE, DEFAULT_QUOTE_CHARACTER,\
+from mockerena.fakers import current_faker
+from mockerena.generate import merge_chunks
+from mockerena.settings import DEFAULT_FILE_FORMAT, DEFAULT_INCLUDE_HEAD, DEFAULT_QUOTE_CHARACTER,\
     DEFAULT_EXCLUDE_NULL, DEFAULT_DELIMITER, DEFAULT_KEY_SEPARATOR, DEFAULT_IS_NESTED, DEFAULT_RESPONSES
 
+STREAMING_FORMATS = ('csv', 'json', 'sql', 'tsv')
+
 
 def to_boolean(var: Any) -> bool:
     """Convert string or object to boolean
@@ -99,12 +101,15 @@ def generate_xml_template(columns: dict, root_node: str = None) -> str:
     return f'{wrapper[0]}{{% for r in records %}}{_generate_xml_template(columns)}{{% endfor %}}{wrapper[1]}'
 
 
-def format_output(mock: dict, schema: dict, size: int = DEFAULT_SIZE) -> tuple:  # pylint: disable=R0914
+def format_output(mock: dict, schema: dict, chunks: Iterator = None) -> tuple:  # pylint: disable=R0912,R0914,R0915
     """Formats output as defined in schema
 
+    If there are more chunks of mock data, CSV, TSV, JSON and SQL output is streamed one chunk at a time. Other formats
+    merge the chunks first.
+
     :param dict mock: Mock data
     :param dict schema: Provider integration data schema
-    :param int size: Number of rows
+    :param Iterator[dict] chunks: Mock data for the rows after ``mock``
     :return: A http response
     :rtype: tuple
     """
@@ -121,52 +126,51 @@ def format_output(mock: dict, schema: dict, size: int = DEFAULT_SIZE) -> tuple:
     # Determine how the service will respond
     responses = schema.get('responses', DEFAULT_RESPONSES)
     responses = responses if isinstance(responses, (list, tuple)) and responses else DEFAULT_RESPONSES
-    response = random.choices(responses, weights=[response.get('weight', 1) for response in responses])[0]
+    weights = [response.get('weight', 1) for response in responses]
+    response = current_faker().random.choices(responses, weights=weights)[0]
     status_code = response.get('status_code', 200)
     headers = response.get('headers', None)
 
+    static = isinstance(response.get('data'), str)
+    streamed = chunks is not None and file_format in STREAMING_FORMATS and not static
+    data = chain([mock], chunks or [])
+
+    # Formats that can't be streamed need every row at once
+    if chunks is not None and not (streamed or static):
+        data = iter([merge_chunks(data)])
+
     # Remove truncated columns
-    for column in truncated_columns:
-        mock.pop(column, None)
+    data = _truncate(data, truncated_columns)
 
-    if isinstance(response.get('data'), str):
+    if static:
         content = response.get('data')
         content_type = response.get('content_type', 'text/plain')
 
     elif file_format in ('csv', 'tsv'):
         _delimiter = delimiter if delimiter and len(delimiter) == 1 else ('\t' if file_format == 'tsv' else ',')
-        content = _format_pandas(mock, _delimiter, include_header, quote_character)
+        content = _stream(data, lambda chunk, first: _format_pandas(
+            chunk, _delimiter, include_header and first, quote_character
+        ))
         content_type = response.get('content_type', 'text/csv')
 
     elif file_format == 'json':
-        content = _format_json(mock, sep=key_separator, exclude_null=exclude_null, is_nested=is_nested)
+        content = _stream(data, lambda chunk, first: _format_json(
+            chunk, sep=key_separator, exclude_null=exclude_null, is_nested=is_nested
+        )[1:-1], separator=', ', wrap=('[', ']'))
         content_type = response.get('content_type', 'application/json')
 
     elif file_format == 'sql':
-
-        def get_row(row: int) -> Any:
-            """Get row data from dataset
-
-            :param int row: Row number
-            :return: Row data
-            :rtype: Any
-            """
-
-            return tuple([mock[column][row] for column in mock.keys()])
-
         table_name = schema.get('table_name', 'EXAMPLE_DATA')
-        fields = ', '.join(mock.keys())
-
-        # noinspection SqlNoDataSourceInspection
-        content = "\n".join([f"INSERT INTO {table_name} ({fields}) VALUES {get_row(row)};" for row in range(0, size)])
+        content = _stream(data, lambda chunk, first: _format_sql(chunk, table_name), separator='\n')
         content_type = response.get('content_type', 'application/sql')
 
     elif file_format == 'xml' or schema.get('template', None):
+        mock = next(data)
 
         key_words = {
             "include_header": include_header,
             "request_param": request.args,
-            "fake": fake,
+            "fake": current_faker(schema.get('locale')),
             "exclude_null": exclude_null
         }
 
@@ -202,7 +206,12 @@ def format_output(mock: dict, schema: dict, size: int = DEFAULT_SIZE) -> tuple:
     now = datetime.datetime.now().strftime("%Y%m%d%H%M")
     filename = schema.get('file_name', schema.get('schema', 'file') + '_{}').format(now)
 
-    resp = make_response(content, status_code)
+    if streamed:
+        resp = Response(stream_with_context(content), status_code)
+
+    else:
+        resp = make_response(content if isinstance(content, str) else ''.join(content), status_code)
+
     resp.headers["Content-Type"] = content_type
     resp.headers["Content-Disposition"] = f'attachment; filename={filename}.{file_format}'
 
@@ -213,6 +222,42 @@ def format_output(mock: dict, schema: dict, size: int = DEFAULT_SIZE) -> tuple:
     return resp
 
 
+def _truncate(chunks: Iterable[dict], columns: list) -> Iterator[dict]:
+    """Removes truncated columns from chunks of mock data
+
+    :param Iterable[dict] chunks: Chunks of mock data
+    :param list columns: Truncated column names
+    :return: Chunks of mock data
+    :rtype: Iterator[dict]
+    """
+
+    for chunk in chunks:
+
+        for column in columns:
+            chunk.pop(column, None)
+
+        yield chunk
+
+
+def _stream(chunks: Iterable[dict], render: Callable, separator: str = '', wrap: tuple = ('', '')) -> Iterator[str]:
+    """Renders chunks of mock data one at a time
+
+    :param Iterable[dict] chunks: Chunks of mock data
+    :param Callable render: Function taking a chunk and whether it is the first chunk, returning a string
+    :param str separator: String between chunks
+    :param tuple wrap: Strings before the first and after the last chunk
+    :return: Rendered strings
+    :rtype: Iterator[str]
+    """
+
+    yield wrap[0]
+
+    for index, chunk in enumerate(chunks):
+        yield separator + render(chunk, index == 0) if index else render(chunk, index == 0)
+
+    yield wrap[1]
+
+
 def _format_pandas(mock: dict, sep: str, header: bool, quote_character: str = '"') -> str:
     """Returns mock data as csv format
 
@@ -224,6 +269,8 @@ def _format_pandas(mock: dict, sep: str, header: bool, quote_character: str = '"
     :rtype: str
     """
 
+    import pandas as pd  # pylint: disable=C0415
+
     return pd.DataFrame(mock).to_csv(sep=sep, index=None, header=header, quotechar=quote_character)
 
 
@@ -238,11 +285,28 @@ def _format_json(mock: dict, sep: str, exclude_null: bool = False, is_nested: bo
     :rtype: str
     """
 
+    import pandas as pd  # pylint: disable=C0415
+
     data_frame = pd.DataFrame(mock)
     records = [row.dropna().to_dict() if exclude_null else row.to_dict() for _, row in data_frame.iterrows()]
     return simplejson.dumps([un_flatten(record, sep) if is_nested else record for record in records], ignore_nan=True)
 
 
+def _format_sql(mock: dict, table_name: str) -> str:
+    """Returns mock data as SQL insert statements
+
+    :param dict mock: Mock data
+    :param str table_name: Table name
+    :return: SQL insert statements
+    :rtype: str
+    """
+
+    fields = ', '.join(mock.keys())
+
+    # noinspection SqlNoDataSourceInspection
+    return "\n".join([f"INSERT INTO {table_name} ({fields}) VALUES {row};" for row in zip(*mock.values())])
+
+
 def _format_template(mock: dict, template: str, **kwargs) -> str:
     """Returns mock data in html format
 
@@ -252,5 +316,7 @@ def _format_template(mock: dict, template: str, **kwargs) -> str:
     :rtype: str
     """
 
+    import pandas as pd  # pylint: disable=C0415
+
     data = pd.DataFrame(mock).to_dict(orient='records')
     return Template(template).render(records=data, **kwargs)
@@ -6,18 +6,27 @@
 
 import datetime
 import decimal
-import random
+import json
+import logging
 import re
-from types import GeneratorType
-from typing import Any, Union
+from concurrent.futures import Executor, Future
+from copy import deepcopy
+from functools import partial
+from itertools import chain
+from types import CodeType, GeneratorType, MappingProxyType
+from typing import Any, Callable, Hashable, Iterator, Mapping, NamedTuple, Optional, Union
 
-from faker import Faker
 from flask import request
-from mockerena.providers import MockProvider
-from mockerena.settings import DEFAULT_SIZE
+import numpy as np
+from mockerena.batch import batch_provider, numpy_generator
+from mockerena.cache import LRUCache, SizedLRUCache, fingerprint
+from mockerena.fakers import current_faker, fake, local_faker, reseeded
+from mockerena.parallel import derive_seed, get_pool, pool_lookahead
+from mockerena.settings import BLOCK_SIZE, DEFAULT_SIZE, FUNCTION_CACHE_SIZE, PLAN_CACHE_SIZE, POOL_MEMORY, \
+    SHARD_SIZE, UNIQUE_RETRIES
+from mockerena.vectorize import referenced_fields, to_array, vectorize
 
-fake = Faker()
-fake.add_provider(MockProvider)
+logger = logging.getLogger(__name__)
 
 
 def age(date: Union[datetime.datetime, datetime.date]) -> int:
@@ -124,7 +133,22 @@ def is_safe(expression: str) -> bool:
     return bool(re.match(PATTERN, str(expression)))
 
 
-def make_safe(datum: Any, column: dict = None) -> Union[dict, float, int, list, str]:  #
+def date_to_string(item: Union[datetime.date, datetime.datetime, datetime.time], column: dict = None) -> str:
+    """Return item formatted as a date string
+
+    :param Union[datetime.date, datetime.datetime, datetime.time] item: Date/time object
+    :param dict column: Column data
+    :return: Datetime string
+    :rtype: str
+    """
+
+    return item.strftime(column['format']) if column and 'format' in column else item.isoformat()
+
+
+PRIMITIVE_TYPES = frozenset((bool, float, int, str, type(None)))
+
+
+def make_safe(datum: Any, column: dict = None) -> Union[dict, float, int, list, str]:
     """Convert datum item to JSON safe output
 
     :param Any datum: Datum item
@@ -133,99 +157,682 @@ def make_safe(datum: Any, column: dict = None) -> Union[dict, float, int, list,
     :rtype: dict, float, int, list, str
     """
 
-    def format_date(item: Union[datetime.date, datetime.datetime, datetime.time]) -> str:
-        """Return item formatted as a date string
-
-        :param Union[datetime.date, datetime.datetime, datetime.time] item: Date/time object
-        :return: Datetime string
-        :rtype: str
-        """
-
-        return item.strftime(column['format']) if column and 'format' in column else item.isoformat()
-
-    functions = {
-        bytes: lambda item: item.decode('utf-8', errors="ignore"),
-        datetime.date: format_date,
-        datetime.datetime: format_date,
-        datetime.time: format_date,
-        datetime.timedelta: str,
-        decimal.Decimal: float,
-        dict: lambda item: {k: make_safe(v, column) for (k, v) in item.items()},
-        list: lambda item: [make_safe(i, column) for i in item],
-        set: lambda item: [make_safe(i, column) for i in item],
-        tuple: lambda item: [make_safe(i, column) for i in item],
-        GeneratorType: lambda item: [make_safe(i, column) for i in item],
-    }
-
     if isinstance(datum, (datetime.date, datetime.datetime, datetime.time)):
-        return datum.strftime(column['format']) if column and 'format' in column else datum.isoformat()
+        return date_to_string(datum, column)
+
+    converter = CONVERTERS.get(type(datum))
+    return converter(datum, column) if converter else datum
+
+
+CONVERTERS = {
+    bytes: lambda item, column: item.decode('utf-8', errors="ignore"),
+    datetime.timedelta: lambda item, column: str(item),
+    decimal.Decimal: lambda item, column: float(item),
+    dict: lambda item, column: {k: make_safe(v, column) for (k, v) in item.items()},
+    list: lambda item, column: [make_safe(i, column) for i in item],
+    set: lambda item, column: [make_safe(i, column) for i in item],
+    tuple: lambda item, column: [make_safe(i, column) for i in item],
+    GeneratorType: lambda item, column: [make_safe(i, column) for i in item],
+}
+
+
+def convert_column(data: list, column: dict = None) -> list:
+    """Convert a column of data to JSON safe output
 
-    return functions.get(type(datum), lambda item: item)(datum)
+    The conversion is chosen once for the whole column from the types of its values. Columns of primitive values are
+    returned as they are and columns of a single date/time type are formatted directly. Anything else is converted
+    value by value with make_safe.
 
+    :param list data: Column data
+    :param dict column: Column data
+    :return: JSON serializable output
+    :rtype: list
+    """
+
+    types = set(map(type, data))
+
+    if types <= PRIMITIVE_TYPES:
+        return data
+
+    if len(types) == 1 and issubclass(next(iter(types)), (datetime.date, datetime.time)):
+
+        if column and 'format' in column:
+            date_format = column['format']
+            return [item.strftime(date_format) for item in data]
 
-def data_for_column(column: dict, kwargs: dict, size: int) -> list:
-    """Generates data for schema column
+        return list(map(next(iter(types)).isoformat, data))
+
+    return [make_safe(item, column) for item in data]
+
+
+class ColumnPlan(NamedTuple):
+    """Resolved generation steps for a single column
+    """
+
+    name: str
+    data_type: str
+    kwargs: Mapping
+    percent_empty: float
+    convert: Callable
+    batch: Optional[Callable]
+    pool_size: int
+    unique: bool
+    locale: Optional[str]
+    key: str
+
+
+class GenerationPlan(NamedTuple):
+    """Resolved generation steps for a schema
+    """
+
+    columns: tuple
+    functions: Mapping
+    vectors: Mapping
+    fields: Mapping
+    order: tuple
+
+
+FUNCTION_CACHE = LRUCache(FUNCTION_CACHE_SIZE)
+PLAN_CACHE = LRUCache(PLAN_CACHE_SIZE)
+POOL_CACHE = SizedLRUCache(POOL_MEMORY)
+
+
+def compile_column(column: dict, locale: str = None) -> ColumnPlan:
+    """Resolves the provider type, arguments, locale and converter for a column
+
+    Plans are shared between requests, so the provider method is looked up on the request's Faker instance for the
+    column's locale when data is generated.
 
     :param dict column: Column definition
-    :param dict kwargs: Faker keyword arguments
+    :param str locale: Schema locale, used when the column doesn't set its own
+    :return: Column plan
+    :rtype: ColumnPlan
+    :raises: AttributeError
+    """
+
+    data_type = column.get('type', 'empty')
+    locale = column.get('locale', locale)
+
+    if not hasattr(local_faker(locale), data_type):
+        raise AttributeError(f"Exception at column {column.get('name', '')}, '{data_type}' is not a valid data type")
+
+    kwargs = MappingProxyType(deepcopy(column.get('args', {})))
+
+    return ColumnPlan(
+        name=column['name'],
+        data_type=data_type,
+        kwargs=kwargs,
+        percent_empty=column.get('percent_empty', 0),
+        convert=partial(convert_column, column=deepcopy(column)),
+        batch=batch_provider(data_type, kwargs),
+        pool_size=column.get('pool_size', 0),
+        unique=bool(column.get('unique', False)),
+        locale=locale,
+        key=fingerprint(dict({key: column.get(key) for key in ('type', 'args', 'format', 'pool_size')}, locale=locale))
+    )
+
+
+def compile_function(expression: str) -> Optional[CodeType]:
+    """Validates and compiles a column function, reusing the code object for identical expressions
+
+    :param str expression: Python expression
+    :return: Compiled expression or None if the expression isn't safe to run
+    :rtype: Optional[CodeType]
+    :raises: SyntaxError
+    """
+
+    code = FUNCTION_CACHE.get(expression)
+
+    if code is None and is_safe(expression):
+        code = compile(expression, '<function>', 'eval')
+        FUNCTION_CACHE.set(expression, code)
+
+    return code
+
+
+def order_functions(fields: Mapping) -> tuple:
+    """Orders function columns so each one runs after the function columns it reads
+
+    Columns that depend on each other keep their schema order.
+
+    :param Mapping fields: Mapping of function column to the columns it reads (None being every column)
+    :return: Function columns in evaluation order
+    :rtype: tuple
+    """
+
+    ordered, pending = [], list(fields)
+
+    while pending:
+        waiting = set(pending)
+        ready = [col for col in pending if not (waiting if fields[col] is None else fields[col]) & (waiting - {col})]
+        ordered.append(ready[0] if ready else pending[0])
+        pending.remove(ordered[-1])
+
+    return tuple(ordered)
+
+
+def compile_plan(columns: list, locale: str = None) -> GenerationPlan:
+    """Compiles a generation plan for a list of columns
+
+    :param list columns: Column definitions
+    :param str locale: Schema locale
+    :return: Generation plan
+    :rtype: GenerationPlan
+    :raises: AttributeError, SyntaxError
+    """
+
+    compiled = tuple(compile_column(column, locale) for column in columns)
+    functions = {col['name']: col['function'] for col in filter(lambda col: 'function' in col, columns)}
+    code, invalid = {}, []
+
+    for col, function in functions.items():
+
+        try:
+            code[col] = compile_function(str(function))
+        except SyntaxError:
+            invalid.append(col)
+
+    unsafe_functions = [col for col, function in code.items() if function is None]
+
+    if unsafe_functions:
+        raise SyntaxError(f"Column(s) {', '.join(unsafe_functions)} does not contain supported functions")
+
+    if invalid:
+        raise SyntaxError(f"Exception for column '{invalid[0]}', function has invalid syntax")
+
+    vectors = {col: vectorize(str(function), APPROVED_GLOBALS) for col, function in functions.items()}
+    fields = {col: referenced_fields(str(function)) for col, function in functions.items()}
+
+    return GenerationPlan(
+        columns=compiled,
+        functions=MappingProxyType(code),
+        vectors=MappingProxyType({col: vector for col, vector in vectors.items() if vector}),
+        fields=MappingProxyType(fields),
+        order=order_functions(fields)
+    )
+
+
+def get_plan(schema: dict) -> GenerationPlan:
+    """Returns a cached generation plan for a schema, compiling one if necessary
+
+    :param dict schema: Provider integration data schema
+    :return: Generation plan
+    :rtype: GenerationPlan
+    """
+
+    key = fingerprint([schema['columns'], schema.get('locale')])
+    plan = PLAN_CACHE.get(key)
+
+    if plan is None:
+        plan = compile_plan(schema['columns'], schema.get('locale'))
+        PLAN_CACHE.set(key, plan)
+
+    return plan
+
+
+def scatter(data: list, empty: np.ndarray) -> list:
+    """Places values into the non-empty positions of a column
+
+    :param list data: Values for non-empty rows, in order
+    :param np.ndarray empty: Boolean mask of empty rows
+    :return: Column with None in empty rows
+    :rtype: list
+    """
+
+    values = iter(data)
+    return [None if is_empty else next(values) for is_empty in empty.tolist()]
+
+
+def value_pool(column: ColumnPlan) -> list:
+    """Returns pre-generated values for a column with a pool_size, generating them on first use
+
+    Pools are shared by columns with the same type, arguments, format, locale and pool size. They're generated from a
+    seed derived from those settings rather than from the request, so a column always samples from the same pool.
+
+    :param ColumnPlan column: Column plan
+    :return: Pool of converted values
+    :rtype: list
+    """
+
+    pool = POOL_CACHE.get(column.key)
+
+    if pool is None:
+
+        with reseeded(current_faker(column.locale), int(column.key, 16)) as faker:
+            method = getattr(faker, column.data_type)
+            pool = column.convert([method(**column.kwargs) for _ in range(column.pool_size)])
+
+        POOL_CACHE.set(column.key, pool)
+
+    return pool
+
+
+def unique_key(value: Any) -> Hashable:
+    """Returns a hashable key for comparing generated values
+
+    :param Any value: Converted value
+    :return: The value itself or its JSON representation for containers
+    :rtype: Hashable
+    """
+
+    return json.dumps(value, sort_keys=True, default=str) if isinstance(value, (dict, list)) else value
+
+
+def unique_values(generate: Callable, count: int, seen: set, name: str) -> list:
+    """Generates values until there are enough that haven't been seen before
+
+    Duplicates are drawn again, up to UNIQUE_RETRIES duplicates in a row, after which the provider is considered to
+    have run out of unique values.
+
+    :param Callable generate: Function taking a number of values and returning that many values
+    :param int count: Number of unique values
+    :param set seen: Keys of values already used by the column, updated in place
+    :param str name: Column name
+    :return: Unique values
+    :rtype: list
+    :raises: ValueError
+    """
+
+    data = []
+    duplicates = 0
+
+    while len(data) < count:
+
+        for value in generate(count - len(data)):
+            key = unique_key(value)
+
+            if key in seen:
+                duplicates += 1
+
+                if duplicates > UNIQUE_RETRIES:
+                    raise ValueError(f"Exception at column {name}, could only generate {len(seen)} unique values")
+
+                continue
+
+            seen.add(key)
+            data.append(value)
+            duplicates = 0
+
+    return data
+
+
+def column_sampler(column: ColumnPlan, rng: np.random.Generator, pool: list = None) -> Callable:
+    """Returns a function that generates a number of values for a column
+
+    :param ColumnPlan column: Column plan
+    :param np.random.Generator rng: Seeded NumPy generator
+    :param list pool: Column's value pool, looked up if the column has a pool_size and it isn't provided
+    :return: Function taking a number of values and returning that many values
+    :rtype: Callable
+    """
+
+    if column.pool_size:
+        pool = value_pool(column) if pool is None else pool
+        return lambda length: [pool[index] for index in rng.integers(0, len(pool), length).tolist()]
+
+    if column.batch:
+        return partial(column.batch, rng)
+
+    method, kwargs, convert = getattr(current_faker(column.locale), column.data_type), column.kwargs, column.convert
+    return lambda length: convert([method(**kwargs) for _ in range(length)])
+
+
+def data_for_block(column: ColumnPlan, size: int, seed: int, seen: set = None, pool: list = None) -> list:
+    """Generates data for a block of rows of a schema column
+
+    The column's Faker instance is seeded for the block and its random state restored afterwards, so the rest of the
+    request sees the same state whether the block was generated in-process or in the process pool.
+
+    :param ColumnPlan column: Column plan
     :param int size: Number of rows
+    :param int seed: Seed for the block's random data
+    :param set seen: Keys of values already used by a unique column (ex. in previous blocks)
+    :param list pool: Column's value pool, looked up if the column has a pool_size and it isn't provided
     :return: List of random data for a column
     :rtype: list
     """
 
+    with reseeded(current_faker(column.locale), seed) as faker:
+        rng = numpy_generator(faker.random)
+
+        # Decide which rows are empty up front so the provider only runs for rows that need a value
+        empty = rng.random(size) < column.percent_empty if column.percent_empty else None
+        count = size - int(empty.sum()) if empty is not None else size
+        generate = column_sampler(column, rng, pool)
+
+        if column.unique:
+            data = unique_values(generate, count, set() if seen is None else seen, column.name)
+
+        else:
+            data = generate(count)
+
+    return scatter(data, empty) if empty is not None else data
+
+
+def data_for_column(column: ColumnPlan, rows: range, total: int, seed: int, seen: set = None) -> list:
+    """Generates data for a range of rows of a schema column
+
+    Rows are generated in blocks of BLOCK_SIZE rows, each seeded from the column's seed and the block's index, so a
+    range of rows is the same as the corresponding slice of every larger range and only costs the blocks it overlaps.
+    The column's value pool is looked up once for all blocks, so a pool too large for POOL_MEMORY is still only
+    generated once per range.
+
+    :param ColumnPlan column: Column plan
+    :param range rows: Rows to generate
+    :param int total: Total number of rows in the data set, which ends its last block
+    :param int seed: Seed for the column's random data
+    :param set seen: Keys of values already used by a unique column (ex. in previous rows)
+    :return: List of random data for a column
+    :rtype: list
+    """
+
+    seen = set() if seen is None else seen
+    pool = value_pool(column) if column.pool_size else None
     data = []
-    data_type = column.get('type', 'empty')
 
-    try:
-        method = getattr(fake, data_type)
-    except AttributeError:
-        raise AttributeError(f"Exception at column {column.get('name', '')}, '{data_type}' is not a valid data type")
+    for block in range(rows.start // BLOCK_SIZE, -(-rows.stop // BLOCK_SIZE)):
+        start = block * BLOCK_SIZE
+        values = data_for_block(column, min(BLOCK_SIZE, total - start), derive_seed(seed, block), seen, pool)
+        data.extend(values[max(rows.start - start, 0):rows.stop - start])
 
-    percent_empty = column.get('percent_empty', 0)
+    return data
 
-    for _ in range(size):
 
-        if random.random() <= percent_empty:
-            data.append(None)
+def generate_column(column: dict, rows: range, total: int, seed: int, locale: str = None) -> list:
+    """Generates data for a column definition, used by worker processes
+
+    :param dict column: Column definition
+    :param range rows: Rows to generate
+    :param int total: Total number of rows in the data set
+    :param int seed: Seed for the column's random data
+    :param str locale: Schema locale
+    :return: List of random data for a column
+    :rtype: list
+    """
+
+    return data_for_column(compile_column(column, locale), rows, total, seed)
 
-        else:
-            datum = method(**kwargs)
 
-            data.append(make_safe(datum, column))
+def split_rows(rows: range) -> list:
+    """Splits rows into shards of about SHARD_SIZE rows
+
+    Shards start on a multiple of BLOCK_SIZE, so no block is split between two shards.
+
+    :param range rows: Rows to generate
+    :return: List of row ranges
+    :rtype: list
+    """
+
+    step = max(SHARD_SIZE // BLOCK_SIZE, 1) * BLOCK_SIZE
+    bounds = [rows.start] + list(range(rows.start - rows.start % step + step, rows.stop, step)) + [rows.stop]
+    return [range(start, stop) for start, stop in zip(bounds, bounds[1:])] if len(rows) else [rows]
+
+
+def submit_shard(plan: GenerationPlan, columns: list, shard: range, total: int, base: int,  # pylint: disable=R0913
+                 pool: Executor) -> dict:
+    """Starts generating the columns of a shard in the process pool
+
+    Unique columns are generated for every shard up front, in-process (see unique_columns).
+
+    :param GenerationPlan plan: Generation plan
+    :param list columns: Column definitions the plan was compiled from
+    :param range shard: Rows of the shard
+    :param int total: Total number of rows in the data set
+    :param int base: Base seed for the request
+    :param Executor pool: Process pool
+    :return: Futures of column data, by column index
+    :rtype: dict
+    """
+
+    return {
+        index: pool.submit(generate_column, columns[index], shard, total, derive_seed(base, index), column.locale)
+        for index, column in enumerate(plan.columns) if not column.unique
+    }
+
+
+def generate_shard(plan: GenerationPlan, shard: range, total: int, base: int, done: dict = None) -> dict:
+    """Generates data for every column of a shard, before functions are applied
+
+    Every column gets its own seed, derived from the base seed and the column index. Since seeds don't depend on where
+    or when rows are generated, output is the same whether columns are generated in-process or in the process pool.
+
+    :param GenerationPlan plan: Generation plan
+    :param range shard: Rows of the shard
+    :param int total: Total number of rows in the data set
+    :param int base: Base seed for the request
+    :param dict done: Data already generated (ex. for unique columns) or futures of columns submitted to the process
+        pool, by column index
+    :return: Mapping of generated data
+    :rtype: dict
+    """
+
+    done = done or {}
+    data = {
+        index: data_for_column(column, shard, total, derive_seed(base, index))
+        for index, column in enumerate(plan.columns) if index not in done
+    }
+    data.update((index, values.result() if isinstance(values, Future) else values) for index, values in done.items())
+    return {column.name: data[index] for index, column in enumerate(plan.columns)}
+
+
+def unique_columns(plan: GenerationPlan, rows: range, total: int, base: int) -> dict:
+    """Generates the values of unique columns for a range of rows
+
+    Unique columns can run out of values at any row, so they're generated for the whole range before any data is sent,
+    which reports running out as an error instead of ending a stream early. Their values depend on every value before
+    them, so seeking to a row replays them from the first row.
+
+    :param GenerationPlan plan: Generation plan
+    :param range rows: Rows to generate
+    :param int total: Total number of rows in the data set
+    :param int base: Base seed for the request
+    :return: Data of unique columns, by column index
+    :rtype: dict
+    :raises: ValueError
+    """
+
+    data = {}
+
+    for index, column in enumerate(plan.columns):
+        if column.unique:
+            seed, seen = derive_seed(base, index), set()
+            data_for_column(column, range(0, rows.start - rows.start % BLOCK_SIZE), total, seed, seen)
+            data[index] = data_for_column(column, rows, total, seed, seen)
 
     return data
 
 
-def generate_data(schema: dict, size: int = DEFAULT_SIZE) -> dict:
-    """Generates sample data from a schema
+def evaluate_vector(vector: Callable, col: str, mock: dict, size: int) -> Optional[list]:
+    """Evaluates a column function column-wise
 
-    :param dict schema: Provider integration data schema
+    :param Callable vector: Column-wise evaluator
+    :param str col: Function column name
+    :param dict mock: Generated data
     :param int size: Number of rows
+    :return: Function results or None if the function has to be evaluated row by row
+    :rtype: Optional[list]
+    """
+
+    arrays = {}
+
+    def column(name: str) -> np.ndarray:
+        name = col if name is None else name
+        if name not in arrays:
+            arrays[name] = to_array(mock[name])
+        return arrays[name]
+
+    try:
+        result = vector(column)
+    except Exception:  # pylint: disable=W0703
+        return None
+
+    return result.tolist() if np.ndim(result) else [result] * size
+
+
+def uses_name(code: CodeType, name: str) -> bool:
+    """Returns true if compiled code (or code nested in it, ex. a lambda) reads a name
+
+    :param CodeType code: Compiled code
+    :param str name: Global or local name
+    :return: True if the code reads the name
+    :rtype: bool
+    """
+
+    return name in code.co_names or any(
+        uses_name(const, name) for const in code.co_consts if isinstance(const, CodeType)
+    )
+
+
+def evaluate_rows(function: CodeType, col: str, fields: Optional[frozenset], mock: dict,  # pylint: disable=R0913,R0914
+                  rows: range, base: int, locale: str = None) -> list:
+    """Evaluates a column function row by row
+
+    Functions using 'fake' get it seeded from the row's position in the data set, so their values don't depend on
+    which rows were generated before them (ex. for a page of rows).
+
+    :param CodeType function: Compiled column function
+    :param str col: Function column name
+    :param Optional[frozenset] fields: Columns the function reads (None being every column)
+    :param dict mock: Generated data
+    :param range rows: Rows of the data set the data is for
+    :param int base: Base seed for the request
+    :param str locale: Locale of the column, used by 'fake'
+    :return: Function results
+    :rtype: list
+    """
+
+    faker = current_faker(locale)
+    seeded = uses_name(function, 'fake')
+    approved_locals = {'param': request.args, 'fake': faker}  # 'param' can be used to evaluate
+    columns = [(name, mock[name]) for name in (mock if fields is None else fields) if name in mock]
+    this = mock[col]
+    results = []
+
+    with reseeded(faker):
+
+        for index, row in enumerate(rows):
+            approved_locals['field'] = {name: values[index] for name, values in columns}
+            approved_locals['this'] = this[index]  # 'this' can be referenced in function
+
+            if seeded:
+                faker.random.seed(derive_seed(base, col, row))
+
+            try:
+                results.append(eval(function, APPROVED_GLOBALS, approved_locals))  # pylint: disable=W0123
+            except Exception as err:
+                raise type(err)(f"Exception for column '{col}', {str(err)}")
+
+    return results
+
+
+def apply_functions(plan: GenerationPlan, mock: dict, rows: range, base: int) -> dict:
+    """Applies column functions to generated data
+
+    Column functions run in dependency order, so a function reading another function column sees its result.
+
+    :param GenerationPlan plan: Generation plan
+    :param dict mock: Generated data
+    :param range rows: Rows of the data set the data is for
+    :param int base: Base seed for the request
     :return: Mapping of generated data
     :rtype: dict
     """
 
-    mock = {column['name']: data_for_column(column, column.get('args', {}), size) for column in schema['columns']}
-    functions = {col['name']: col['function'] for col in filter(lambda col: 'function' in col, schema['columns'])}
-    unsafe_functions = {column: function for column, function in functions.items() if not is_safe(function)}
+    vectorized = []
+    locales = {column.name: column.locale for column in plan.columns}
 
-    if unsafe_functions:
-        raise SyntaxError(f"Column(s) {', '.join(unsafe_functions.keys())} does not contain supported functions")
+    for col in plan.order:
+        result = evaluate_vector(plan.vectors[col], col, mock, len(rows)) if col in plan.vectors else None
+
+        if result is None:
+            result = evaluate_rows(plan.functions[col], col, plan.fields[col], mock, rows, base, locales.get(col))
 
-    if functions:
+        else:
+            vectorized.append(col)
+
+        mock[col] = result
+
+    if vectorized:
+        logger.debug("Column(s) %s evaluated column-wise", ', '.join(vectorized))
+
+    return mock
+
+
+def page_rows(size: int, offset: int = 0, limit: int = None) -> range:
+    """Returns the rows of a page of a data set
+
+    :param int size: Number of rows in the data set
+    :param int offset: First row of the page
+    :param int limit: Maximum number of rows in the page
+    :return: Rows of the page
+    :rtype: range
+    """
+
+    return range(min(offset, size), size if limit is None else min(offset + limit, size))
+
+
+def generate_chunks(schema: dict, size: int = DEFAULT_SIZE, offset: int = 0,  # pylint: disable=R0914
+                    limit: int = None) -> Iterator[dict]:
+    """Generates sample data from a schema one shard of about SHARD_SIZE rows at a time
+
+    Column functions only read values from their own row, so merging the chunks gives the same data as generating every
+    row at once, while only a few chunks are held in memory at a time. If the whole request is large enough to use the
+    process pool, the next shards are submitted to the pool while the current one is being sent.
+
+    :param dict schema: Provider integration data schema
+    :param int size: Number of rows in the data set
+    :param int offset: First row to return
+    :param int limit: Maximum number of rows to return
+    :return: Mappings of generated data
+    :rtype: Iterator[dict]
+    """
 
-        approved_locals = {'param': request.args}  # 'param' can be used to evaluate
+    plan = get_plan(schema)
+    base = current_faker().random.getrandbits(64)
+    rows = page_rows(size, offset, limit)
+    unique = unique_columns(plan, rows, size, base)
+    shards = split_rows(rows)
+    pool = get_pool(len(rows) * len(plan.columns))
+    lookahead = pool_lookahead(sum(not column.unique for column in plan.columns)) if pool else 0
+    submitted = {}
+
+    try:
+        for position, shard in enumerate(shards):
+
+            for ahead in range(position, min(position + lookahead + 1, len(shards))):
+                if pool and ahead not in submitted:
+                    submitted[ahead] = submit_shard(plan, schema['columns'], shards[ahead], size, base, pool)
+
+            done = {index: values[shard.start - rows.start:shard.stop - rows.start] for index, values in unique.items()}
+            done.update(submitted.pop(position, {}))
+            yield apply_functions(plan, generate_shard(plan, shard, size, base, done), shard, base)
+
+    finally:
+        cancel_shards(submitted)
+
+
+def cancel_shards(submitted: dict):
+    """Stops work on shards submitted to the process pool that won't be sent (ex. the client disconnected)
+
+    :param dict submitted: Futures of column data, by shard position and column index
+    """
+
+    for future in chain.from_iterable(futures.values() for futures in submitted.values()):
+        future.cancel()
+
+
+def merge_chunks(chunks: Iterator[dict]) -> dict:
+    """Merges chunks of mock data into a single mapping
+
+    :param Iterator[dict] chunks: Chunks of mock data
+    :return: Mock data
+    :rtype: dict
+    """
 
-        for row in range(0, size):
-            approved_locals['field'] = {column: mock[column][row] for column in mock}
-            for col in functions:
-                approved_locals['this'] = approved_locals['field'][col]  # 'this' can be referenced in function
+    mock = next(chunks)
 
-                try:
-                    mock[col][row] = eval(functions[col], APPROVED_GLOBALS, approved_locals)  # pylint: disable=W0123
-                except SyntaxError:
-                    raise SyntaxError(f"Exception for column '{col}', function has invalid syntax")
-                except Exception as err:
-                    raise type(err)(f"Exception for column '{col}', {str(err)}")
+    for chunk in chunks:
+        for column, values in chunk.items():
+            mock[column].extend(values)
 
     return mock
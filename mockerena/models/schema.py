@@ -6,6 +6,9 @@
 
 from copy import deepcopy
 
+from faker.config import AVAILABLE_LOCALES
+
+MAX_POOL_SIZE = 100000
 
 SCHEMA = {
     "item_title": "schema",
@@ -42,6 +45,10 @@ SCHEMA = {
         "table_name": {
             "type": "string"
         },
+        "locale": {
+            "type": "string",
+            "allowed": sorted(AVAILABLE_LOCALES)
+        },
         "columns": {
             "type": "list",
             "schema": {
@@ -56,7 +63,17 @@ SCHEMA = {
                         "min": 0,
                         "max": 1
                     },
+                    "pool_size": {
+                        "type": "integer",
+                        "min": 1,
+                        "max": MAX_POOL_SIZE
+                    },
                     "truncate": {"type": "boolean"},
+                    "unique": {"type": "boolean"},
+                    "locale": {
+                        "type": "string",
+                        "allowed": sorted(AVAILABLE_LOCALES)
+                    },
                     "function": {"type": "string"},
                     "description": {"type": "string"}
                 }
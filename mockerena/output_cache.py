@@ -0,0 +1,270 @@
+"""Caching of formatted responses for seeded requests
+
+A seeded request always returns the same output for the same schema and query parameters, so its formatted body,
+status and headers are cached and returned as they are to identical requests. Seeded responses also carry a strong
+ETag, so clients that already have a response get a 304 without it being generated. Unseeded requests are never
+cached.
+
+Bodies are cached in memory, unless a disk cache directory is configured and the body is larger than
+DISK_CACHE_THRESHOLD. Bodies cached on disk (optionally with a gzipped copy) are sent straight from their file with
+the server's ``wsgi.file_wrapper``, which lets servers like gunicorn use ``sendfile``.
+
+.. codeauthor:: John Lane <john.lane93@gmail.com>
+
+"""
+
+import gzip
+import os
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from faker import VERSION as FAKER_VERSION
+from flask import Response, request
+from werkzeug.wsgi import wrap_file
+
+from mockerena import __version__
+from mockerena.cache import DiskLRUCache, SizedLRUCache, fingerprint
+from mockerena.settings import BLOCK_SIZE, DISK_CACHE_DIR, DISK_CACHE_GZIP, DISK_CACHE_SIZE, DISK_CACHE_THRESHOLD, \
+    RESPONSE_CACHE_MEMORY
+
+
+class CachedResponse(NamedTuple):
+    """Formatted response of a seeded request
+    """
+
+    body: bytes
+    status: int
+    headers: tuple
+
+
+RESPONSE_CACHE = SizedLRUCache(RESPONSE_CACHE_MEMORY)
+DISK_CACHE = DiskLRUCache(DISK_CACHE_DIR, DISK_CACHE_SIZE) if DISK_CACHE_DIR else None
+
+
+def response_key(schema: dict) -> Optional[str]:
+    """Returns the cache key for the current request's response, which is also its ETag
+
+    Stored schemas are identified by the ETag and update time Eve keeps for them, so the whole document doesn't have
+    to be hashed. Seeded output also depends on the versions of mockerena and Faker and on BLOCK_SIZE, so responses
+    cached on disk aren't reused after an upgrade or a configuration change.
+
+    :param dict schema: Provider integration data schema
+    :return: Cache key, or None if the request isn't seeded
+    :rtype: Optional[str]
+    """
+
+    if 'seed' not in request.args:
+        return None
+
+    version = {key: schema.get(key) for key in ('_id', '_etag', '_updated')} if '_etag' in schema else schema
+    return fingerprint([version, request.args.to_dict(flat=False), __version__, FAKER_VERSION, BLOCK_SIZE])
+
+
+def not_modified(key: Optional[str]) -> Optional[Response]:
+    """Returns a 304 response if the client already has the response for a key
+
+    :param Optional[str] key: Cache key
+    :return: A http response or None if the response has to be sent
+    :rtype: Optional[Response]
+    """
+
+    if not (key and request.method in ('GET', 'HEAD') and request.if_none_match.contains_weak(key)):
+        return None
+
+    response = Response(status=304)
+    response.set_etag(key)
+    return response
+
+
+def cached_response(key: Optional[str]) -> Optional[Response]:
+    """Returns the cached response for a key
+
+    :param Optional[str] key: Cache key
+    :return: A http response or None on a miss
+    :rtype: Optional[Response]
+    """
+
+    if not key or (RESPONSE_CACHE.maxbytes <= 0 and DISK_CACHE is None):
+        return None
+
+    cached = RESPONSE_CACHE.get(key)
+
+    if cached:
+        return Response(cached.body, cached.status, list(cached.headers))
+
+    return _file_response(key) if DISK_CACHE is not None else None
+
+
+def _file_response(key: str) -> Optional[Response]:
+    """Returns a response sending a body cached on disk, gzipped if the client accepts it
+
+    :param str key: Cache key
+    :return: A http response or None on a miss
+    :rtype: Optional[Response]
+    """
+
+    metadata = DISK_CACHE.get(key)
+
+    if metadata is None:
+        return None
+
+    suffix = '.gz' if '.gz' in metadata['files'] and 'gzip' in request.accept_encodings else ''
+
+    try:
+        file = open(DISK_CACHE.path(key, suffix), 'rb')
+    except FileNotFoundError:
+        DISK_CACHE.discard(key)
+        return None
+
+    response = Response(wrap_file(request.environ, file), metadata['status'], metadata['headers'],
+                        direct_passthrough=True)
+    response.content_length = metadata['files'][suffix]
+
+    if '.gz' in metadata['files']:
+        response.vary.add('Accept-Encoding')
+
+    if suffix:
+        response.content_encoding = 'gzip'
+
+    return response
+
+
+class ResponseWriter:
+    """Collects a response body for the response cache
+
+    The body is kept in memory until it's larger than DISK_CACHE_THRESHOLD, after which it's written to files for the
+    disk cache instead. Bodies too large for the cache they're meant for are dropped.
+    """
+
+    def __init__(self, key: str, status: int, headers: tuple):
+        self.key = key
+        self.status = status
+        self.headers = headers
+        self.size = 0
+        self.parts = []
+        self.files = None
+
+    def write(self, data: bytes):
+        """Adds data to the body
+
+        :param bytes data: Body data
+        """
+
+        if self.parts is None and self.files is None:
+            return
+
+        self.size += len(data)
+        limit = DISK_CACHE_THRESHOLD if DISK_CACHE is not None else RESPONSE_CACHE.maxbytes
+
+        if self.files is None and self.size > limit:
+            self._spill()
+
+        if self.files is not None and self.size > DISK_CACHE.maxbytes:
+            self.abort()
+
+        elif self.files is not None:
+            for file in self.files.values():
+                file.write(data)
+
+        elif self.parts is not None:
+            self.parts.append(data)
+
+    def _spill(self):
+        """Moves the body collected so far to files for the disk cache, or drops it without a disk cache
+        """
+
+        if DISK_CACHE is not None:
+            self.files = {'': open(DISK_CACHE.temp_path(self.key), 'wb')}
+
+            if DISK_CACHE_GZIP:
+                self.files['.gz'] = gzip.open(DISK_CACHE.temp_path(self.key, '.gz'), 'wb', compresslevel=6)
+
+            for file in self.files.values():
+                file.writelines(self.parts)
+
+        self.parts = None
+
+    def close(self):
+        """Caches the complete body
+        """
+
+        if self.files is not None:
+
+            for file in self.files.values():
+                file.close()
+
+            DISK_CACHE.set(self.key, {'status': self.status, 'headers': self.headers},
+                           {suffix: DISK_CACHE.temp_path(self.key, suffix) for suffix in self.files})
+
+        elif self.parts is not None:
+            RESPONSE_CACHE.set(self.key, CachedResponse(b''.join(self.parts), self.status, self.headers), self.size)
+
+        self.parts = self.files = None
+
+    def abort(self):
+        """Drops the body, removing any files written for it
+        """
+
+        for suffix, file in (self.files or {}).items():
+            file.close()
+            os.remove(DISK_CACHE.temp_path(self.key, suffix))
+
+        self.parts = self.files = None
+
+
+def cache_response(key: Optional[str], response: Response) -> Response:
+    """Tags a response with its ETag and caches it once its whole body has been generated
+
+    Streamed bodies are recorded as they're sent and only cached if the stream completes.
+
+    :param Optional[str] key: Cache key
+    :param Response response: A http response
+    :return: The response
+    :rtype: Response
+    """
+
+    if not (key and isinstance(response, Response)):
+        return response
+
+    response.set_etag(key)
+
+    if RESPONSE_CACHE.maxbytes <= 0 and DISK_CACHE is None:
+        return response
+
+    headers = tuple((name, value) for name, value in response.headers.items() if name != 'Content-Length')
+    writer = ResponseWriter(key, response.status_code, headers)
+
+    if response.is_streamed:
+        response.response = _record(response.response, response.charset, writer)
+
+    else:
+        writer.write(response.get_data())
+        writer.close()
+
+    return response
+
+
+def _record(body: Iterable, charset: str, writer: ResponseWriter) -> Iterator:
+    """Passes a streamed body through, caching it once complete
+
+    :param Iterable body: Streamed body
+    :param str charset: Character set for encoding text chunks
+    :param ResponseWriter writer: Response cache writer
+    :return: Streamed body
+    :rtype: Iterator
+    """
+
+    try:
+        for chunk in body:
+            yield chunk
+            writer.write(chunk.encode(charset) if isinstance(chunk, str) else chunk)
+
+    except BaseException:
+        writer.abort()
+        raise
+
+    else:
+        writer.close()
+
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
@@ -0,0 +1,61 @@
+"""Process pool for spreading data generation across cores
+
+.. codeauthor:: John Lane <john.lane93@gmail.com>
+
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import hashlib
+from typing import Optional
+
+from mockerena.settings import PARALLEL_THRESHOLD, PARALLEL_WORKERS
+
+
+def derive_seed(base: int, *keys) -> int:
+    """Returns a seed derived from a base seed and keys (ex. a column index)
+
+    Derived seeds only depend on their inputs, so work split across processes stays reproducible.
+
+    :param int base: Base seed
+    :param keys: Keys identifying the unit of work
+    :return: 64 bit seed
+    :rtype: int
+    """
+
+    digest = hashlib.sha256(':'.join(str(key) for key in (base,) + keys).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+@lru_cache(maxsize=None)
+def process_pool(workers: int) -> ProcessPoolExecutor:
+    """Returns a process pool, creating it on first use
+
+    :param int workers: Number of worker processes
+    :return: Process pool
+    :rtype: ProcessPoolExecutor
+    """
+
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def get_pool(cells: int) -> Optional[ProcessPoolExecutor]:
+    """Returns the process pool if parallel generation is enabled and the request is large enough to benefit
+
+    :param int cells: Number of values to generate (rows x columns)
+    :return: Process pool or None
+    :rtype: Optional[ProcessPoolExecutor]
+    """
+
+    return process_pool(PARALLEL_WORKERS) if PARALLEL_WORKERS > 1 and cells >= PARALLEL_THRESHOLD else None
+
+
+def pool_lookahead(tasks: int) -> int:
+    """Returns how many shards to submit to the pool ahead of the shard being sent, so every worker has work
+
+    :param int tasks: Number of tasks per shard (ex. columns generated in the pool)
+    :return: Number of shards
+    :rtype: int
+    """
+
+    return -(-PARALLEL_WORKERS // max(tasks, 1))
@@ -8,6 +8,97 @@ import random
 from typing import Any
 from faker.providers import BaseProvider
 import exrex
+from mockerena.cache import LRUCache
+from mockerena.settings import REGEX_CACHE_SIZE, REGEX_LIMIT
+
+REGEX_CACHE = LRUCache(REGEX_CACHE_SIZE)
+
+
+def parse_regex(expression: str) -> list:
+    """Returns the parsed structure of a regular expression, caching it for later use
+
+    :param str expression: Regular expression
+    :return: Parsed regular expression
+    :rtype: list
+    """
+
+    parsed = REGEX_CACHE.get(expression)
+
+    if parsed is None:
+        parsed = exrex.parse(expression)
+        REGEX_CACHE.set(expression, parsed)
+
+    return parsed
+
+
+def generate_regex(expression: str, size: int = 1, source: random.Random = None) -> list:
+    """Returns strings generated from a regular expression
+
+    Unbounded quantifiers (``*``, ``+``, ``{n,}``) repeat at most ``REGEX_LIMIT`` times.
+
+    :param str expression: Regular expression
+    :param int size: Number of strings to generate
+    :param random.Random source: Random instance to draw from, the random module if not provided
+    :return: Strings generated from a regular expression
+    :rtype: list
+    """
+
+    parsed = parse_regex(expression if isinstance(expression, str) else '')
+    return [_random_match(parsed, source if source is not None else random) for _ in range(size)]
+
+
+def _random_match(parsed: list, source: random.Random, grouprefs: dict = None) -> str:  # pylint: disable=R0912
+    """Returns a random string matching a parsed regular expression
+
+    Mirrors ``exrex._randone``, which always draws from the global random instance, so seeded columns are reproducible.
+
+    :param list parsed: Parsed regular expression
+    :param random.Random source: Random instance to draw from
+    :param dict grouprefs: Strings matched by numbered groups so far
+    :return: Random string
+    :rtype: str
+    """
+
+    sre_parse, grouprefs, string = exrex.sre_parse, {} if grouprefs is None else grouprefs, ''
+
+    for opcode, value in parsed:
+
+        if opcode == sre_parse.IN:
+            string += source.choice(exrex._in(value))  # pylint: disable=W0212
+
+        elif opcode == sre_parse.LITERAL:
+            string += chr(value)
+
+        elif opcode == sre_parse.CATEGORY:
+            string += source.choice(exrex.CATEGORIES.get(value, ['']))
+
+        elif opcode == sre_parse.ANY:
+            string += source.choice(exrex.CATEGORIES['category_any'])
+
+        elif opcode in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            lower, upper, pattern = value
+            upper = lower + REGEX_LIMIT - 1 if upper + 1 - lower >= REGEX_LIMIT else upper
+            string += ''.join(_random_match(list(pattern), source, grouprefs)
+                              for _ in range(source.randint(lower, upper)))
+
+        elif opcode == sre_parse.BRANCH:
+            string += _random_match(source.choice(value[1]), source, grouprefs)
+
+        elif opcode in (sre_parse.SUBPATTERN, sre_parse.ASSERT):
+            match = _random_match(value[-1], source, grouprefs)
+
+            if opcode == sre_parse.SUBPATTERN and value[0]:
+                grouprefs[value[0]] = match
+
+            string += match
+
+        elif opcode == sre_parse.NOT_LITERAL:
+            string += source.choice([char for char in exrex.CATEGORIES['category_any'] if char != chr(value)])
+
+        elif opcode == sre_parse.GROUPREF:
+            string += grouprefs.get(value, '')
+
+    return string
 
 
 class MockProvider(BaseProvider):
@@ -33,7 +124,7 @@ class MockProvider(BaseProvider):
         :rtype: str
         """
 
-        return exrex.getone(expression if isinstance(expression, str) else '')
+        return generate_regex(expression, source=self.generator.random)[0]
 
     # noinspection PyMethodMayBeStatic
     def price(self, minimum: int = 0, maximum: int = 999999) -> float:  # pylint: disable=R0201
@@ -47,7 +138,7 @@ class MockProvider(BaseProvider):
 
         minimum = minimum if isinstance(minimum, (int, float)) else 0
         maximum = maximum if isinstance(maximum, (int, float)) else 999999
-        return round(random.uniform(minimum, maximum), 2)
+        return round(self.generator.random.uniform(minimum, maximum), 2)
 
     # noinspection PyMethodMayBeStatic
     def weighted_choice(self, elements: list = None, weights: list = None) -> Any:  # pylint: disable=R0201
@@ -69,4 +160,4 @@ class MockProvider(BaseProvider):
         if not all([isinstance(attr, (list, tuple)) for attr in (elements, weights)]):
             raise ValueError('`elements` and `weights` must both be lists')
 
-        return random.choices(elements, weights=weights)[0] if elements and weights else None
+        return self.generator.random.choices(elements, weights=weights)[0] if elements and weights else None
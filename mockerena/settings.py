@@ -47,3 +47,26 @@ DEFAULT_DELIMITER = None
 DEFAULT_KEY_SEPARATOR = '.'
 DEFAULT_IS_NESTED = True
 DEFAULT_RESPONSES = [{"status_code": 200}]
+
+# Performance settings
+FUNCTION_CACHE_SIZE = int(os.environ.get('MOCKERENA_FUNCTION_CACHE_SIZE', 512))
+PLAN_CACHE_SIZE = int(os.environ.get('MOCKERENA_PLAN_CACHE_SIZE', 128))
+REGEX_CACHE_SIZE = int(os.environ.get('MOCKERENA_REGEX_CACHE_SIZE', 256))
+REGEX_LIMIT = int(os.environ.get('MOCKERENA_REGEX_LIMIT', 20))
+PARALLEL_WORKERS = int(os.environ.get('MOCKERENA_PARALLEL_WORKERS', 0))
+PARALLEL_THRESHOLD = int(os.environ.get('MOCKERENA_PARALLEL_THRESHOLD', 1000000))
+SHARD_SIZE = int(os.environ.get('MOCKERENA_SHARD_SIZE', 100000))
+BLOCK_SIZE = int(os.environ.get('MOCKERENA_BLOCK_SIZE', 1000))
+POOL_MEMORY = int(os.environ.get('MOCKERENA_POOL_MEMORY', 67108864))
+UNIQUE_RETRIES = int(os.environ.get('MOCKERENA_UNIQUE_RETRIES', 1000))
+FAKER_POOL_SIZE = int(os.environ.get('MOCKERENA_FAKER_POOL_SIZE', 32))
+ASYNC_WORKERS = int(os.environ.get('MOCKERENA_ASYNC_WORKERS', 8))
+ASYNC_THREADS = int(os.environ.get('MOCKERENA_ASYNC_THREADS', 64))
+RESPONSE_CACHE_MEMORY = int(os.environ.get('MOCKERENA_RESPONSE_CACHE_MEMORY', 67108864))
+DISK_CACHE_DIR = os.environ.get('MOCKERENA_DISK_CACHE_DIR', '')
+DISK_CACHE_SIZE = int(os.environ.get('MOCKERENA_DISK_CACHE_SIZE', 1073741824))
+DISK_CACHE_THRESHOLD = int(os.environ.get('MOCKERENA_DISK_CACHE_THRESHOLD', 1048576))
+DISK_CACHE_GZIP = str(os.environ.get('MOCKERENA_DISK_CACHE_GZIP', False)).lower() in ('1', 'true', 'yes')
+SCHEMA_CACHE_SIZE = int(os.environ.get('MOCKERENA_SCHEMA_CACHE_SIZE', 256))
+SCHEMA_CACHE_TTL = float(os.environ.get('MOCKERENA_SCHEMA_CACHE_TTL', 60))
+VALIDATION_CACHE_SIZE = int(os.environ.get('MOCKERENA_VALIDATION_CACHE_SIZE', 1024))
@@ -6,6 +6,7 @@
 
 
 from mockerena import __author__, __email__, __version__
+from mockerena.models.schema import MAX_POOL_SIZE
 from mockerena.settings import BASE_PATH, ENV, HOST, PORT
 from mockerena.settings import DEFAULT_FILE_FORMAT, DEFAULT_INCLUDE_HEAD, DEFAULT_SIZE, DEFAULT_QUOTE_CHARACTER, \
     DEFAULT_EXCLUDE_NULL, DEFAULT_DELIMITER, DEFAULT_KEY_SEPARATOR, DEFAULT_IS_NESTED
@@ -347,6 +348,11 @@ TEMPLATE = {
                     "type": "string",
                     "description": "Table name, only use if `file_format` is `sql`"
                 },
+                "locale": {
+                    "type": "string",
+                    "example": "en_US",
+                    "description": "Faker locale for every column, ex. `en_US`. Default is Faker's default locale"
+                },
                 "columns": {
                     "type": "array",
                     "items": {
@@ -375,6 +381,22 @@ TEMPLATE = {
                                 "format": "float",
                                 "description": "Likeliness that the column will be empty"
                             },
+                            "pool_size": {
+                                "minimum": 1,
+                                "maximum": MAX_POOL_SIZE,
+                                "type": "integer",
+                                "description": "Number of pre-generated values to sample the column from"
+                            },
+                            "unique": {
+                                "type": "boolean",
+                                "default": False,
+                                "description": "True, to never repeat a value in the column. Default is False"
+                            },
+                            "locale": {
+                                "type": "string",
+                                "example": "de_DE",
+                                "description": "Faker locale for the column, overriding the schema's locale"
+                            },
                             "truncate": {
                                 "type": "boolean",
                                 "default": False,
@@ -652,6 +674,21 @@ TEMPLATE = {
             "default": DEFAULT_SIZE,
             "required": False
         },
+        "offset": {
+            "in": "query",
+            "name": "offset",
+            "description": "The first row of the data set to return",
+            "type": "int",
+            "default": 0,
+            "required": False
+        },
+        "limit": {
+            "in": "query",
+            "name": "limit",
+            "description": "The maximum number of rows to return, starting at offset",
+            "type": "int",
+            "required": False
+        },
         "seed": {
             "in": "query",
             "name": "seed",
@@ -0,0 +1,152 @@
+"""Column-wise evaluation of simple column functions
+
+Functions made up only of arithmetic operators, literals, ``this``, ``field['...']`` and element-wise helpers are
+evaluated over entire columns with NumPy object arrays. Object arrays apply the regular Python operators to every
+element (including literals), so results and errors are the same as evaluating the function row by row.
+
+.. codeauthor:: John Lane <john.lane93@gmail.com>
+
+"""
+
+import ast
+from typing import Callable, Mapping, Optional
+
+import numpy as np
+
+ELEMENTWISE_FUNCTIONS = (
+    'abs', 'concat', 'float', 'int', 'len', 'lower', 'replace', 'round', 'str', 'strip', 'title', 'upper'
+)
+
+OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.FloorDiv: np.floor_divide,
+    ast.Mod: np.remainder,
+    ast.Pow: np.power,
+    ast.USub: np.negative,
+    ast.UAdd: np.positive
+}
+
+
+def to_array(values: list) -> np.ndarray:
+    """Returns column values as a one dimensional object array
+
+    :param list values: Column values
+    :return: Object array
+    :rtype: np.ndarray
+    :raises: TypeError
+    """
+
+    if any(isinstance(value, (list, tuple)) for value in values):
+        raise TypeError("Column functions over nested values are evaluated row by row")
+
+    return np.array(values, dtype=object).reshape(len(values))
+
+
+def field_name(node: ast.Subscript) -> Optional[str]:
+    """Returns the column name for a field['...'] lookup
+
+    :param ast.Subscript node: Subscript node
+    :return: Column name or None if not a field lookup
+    :rtype: Optional[str]
+    """
+
+    key = node.slice.value if type(node.slice).__name__ == 'Index' else node.slice  # Python < 3.9
+
+    if not (isinstance(node.value, ast.Name) and node.value.id == 'field'):
+        return None
+
+    try:
+        name = ast.literal_eval(key)
+    except (TypeError, ValueError):
+        return None
+
+    return name if isinstance(name, str) else None
+
+
+def _build(node: ast.AST, functions: Mapping) -> Optional[Callable]:  # pylint: disable=R0911
+    """Builds a column-wise evaluator for an expression node
+
+    :param ast.AST node: Expression node
+    :param Mapping functions: Approved global functions
+    :return: Function taking a column lookup, or None if the node can't be vectorized
+    :rtype: Optional[Callable]
+    """
+
+    try:
+        value = ast.literal_eval(node)
+    except (TypeError, ValueError):
+        pass
+    else:
+        return (lambda column: value) if isinstance(value, (int, float, str)) else None
+
+    if isinstance(node, ast.Name) and node.id == 'this':
+        return lambda column: column(None)
+
+    if isinstance(node, ast.Subscript):
+        name = field_name(node)
+        return (lambda column: column(name)) if name is not None else None
+
+    if isinstance(node, (ast.BinOp, ast.UnaryOp)) and type(node.op) in OPERATORS:
+        operator = OPERATORS[type(node.op)]
+        operands = [_build(operand, functions) for operand in (
+            (node.left, node.right) if isinstance(node, ast.BinOp) else (node.operand,)
+        )]
+        return (lambda column: operator(*[np.asarray(operand(column), dtype=object) for operand in operands])) \
+            if all(operands) else None
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords and \
+            node.func.id in ELEMENTWISE_FUNCTIONS and node.args:
+        function = np.frompyfunc(functions[node.func.id], len(node.args), 1)
+        arguments = [_build(argument, functions) for argument in node.args]
+        return (lambda column: function(*[argument(column) for argument in arguments])) if all(arguments) else None
+
+    return None
+
+
+def referenced_fields(expression: str) -> Optional[frozenset]:
+    """Returns the columns a column function reads through ``field``
+
+    :param str expression: Python expression
+    :return: Column names or None if the expression may read any column
+    :rtype: Optional[frozenset]
+    """
+
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError:
+        return None
+
+    fields, lookups = set(), set()
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Subscript) and field_name(node) is not None:
+            fields.add(field_name(node))
+            lookups.add(node.value)
+
+    if any(isinstance(node, ast.Name) and node.id == 'field' and node not in lookups for node in ast.walk(tree)):
+        return None
+
+    return frozenset(fields)
+
+
+def vectorize(expression: str, functions: Mapping) -> Optional[Callable]:
+    """Returns a column-wise evaluator for a column function if every part of it can be vectorized
+
+    The evaluator takes a column lookup, which returns the object array for a column name (None being ``this``),
+    and returns an object array of results.
+
+    :param str expression: Python expression
+    :param Mapping functions: Approved global functions
+    :return: Column-wise evaluator or None
+    :rtype: Optional[Callable]
+    """
+
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError:
+        return None
+
+    return _build(tree.body, functions)
@@ -48,6 +48,7 @@ setup(
         "Flask>=1.1.0",
         "Jinja2>=2.10",
         "jsonschema>=2.6.0,<3.0.0",
+        "numpy>=1.17.0",
         "pandas>=0.25.0",
         "py-healthcheck>=1.9.0",
         "simplejson>=3.16.0",
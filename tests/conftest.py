@@ -8,7 +8,9 @@ from copy import deepcopy
 from flask import url_for
 from eve import Eve
 import pytest
+from pytest_mock.plugin import MockFixture
 from mockerena.app import app as server
+from mockerena.output_cache import RESPONSE_CACHE
 
 
 MOCK_SCHEMA = {
@@ -57,6 +59,16 @@ def sample_schema() -> dict:
     return deepcopy(MOCK_SCHEMA)
 
 
+@pytest.fixture(autouse=True)
+def response_cache(mocker: MockFixture):
+    """Disable the response cache, so seeded requests are generated every time unless a test enables it
+
+    :param MockFixture mocker: Mocking fixture
+    """
+
+    mocker.patch.object(RESPONSE_CACHE, 'maxbytes', 0)
+
+
 @pytest.fixture(autouse=True)
 def setup_data(client):
     """Setup example schema for testing
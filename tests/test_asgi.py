@@ -0,0 +1,169 @@
+"""test_asgi
+
+.. codeauthor:: John Lane <john.lane93@gmail.com>
+
+"""
+
+import asyncio
+import json
+from typing import Iterator
+from eve import Eve
+from flask import url_for
+import pytest
+from pytest_mock.plugin import MockFixture
+from mockerena.asgi import STREAM_WINDOW, AsgiApplication, application
+
+
+def asgi_request(method: str, path: str, query_string: bytes = b'', body: bytes = b'', headers: list = None) -> tuple:
+    """Sends a request to the ASGI application and collects its response
+
+    :param str method: HTTP method
+    :param str path: Request path
+    :param bytes query_string: Query string
+    :param bytes body: Request body
+    :param list headers: Request headers
+    :return: Status code, headers and ASGI body messages
+    :rtype: tuple
+    """
+
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'query_string': query_string, 'headers': headers or [],
+        'server': ('localhost', 5000), 'client': ('127.0.0.1', 50000), 'scheme': 'http', 'http_version': '1.1'
+    }
+    requests = [{'type': 'http.request', 'body': body[:10], 'more_body': True},
+                {'type': 'http.request', 'body': body[10:], 'more_body': False}]
+    messages = []
+
+    async def receive() -> dict:
+        return requests.pop(0)
+
+    async def send(message: dict):
+        messages.append(message)
+
+    asyncio.run(application(scope, receive, send))
+
+    start, chunks = messages[0], messages[1:]
+    return start['status'], dict(start['headers']), chunks
+
+
+@pytest.mark.asgi
+def test_asgi_index():
+    """Test to ensure pages are served through the ASGI application
+
+    :raises: AssertionError
+    """
+
+    status, headers, chunks = asgi_request('GET', '/')
+    assert status == 200
+    assert headers[b'content-type'].startswith(b'text/html')
+    assert b''.join(chunk['body'] for chunk in chunks)
+    assert not chunks[-1]['more_body']
+
+
+@pytest.mark.asgi
+def test_asgi_generate(client: Eve, sample_schema: dict):
+    """Test to ensure generated data is the same through the ASGI application
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["num_rows"] = 500
+    sample_schema["columns"][0]["type"] = "name"
+    sample_schema["columns"][0]["args"] = {}
+
+    expected = client.post(url_for('custom_schema', seed=7), json=sample_schema)
+    body = json.dumps(sample_schema).encode()
+    status, headers, chunks = asgi_request('POST', '/api/schema/generate', b'seed=7', body,
+                                           [(b'content-type', b'application/json')])
+
+    assert status == 200
+    assert headers[b'content-type'] == expected.headers['Content-Type'].encode()
+    assert b''.join(chunk['body'] for chunk in chunks) == expected.data
+
+
+@pytest.mark.asgi
+def test_asgi_disconnect(mocker: MockFixture):
+    """Test to ensure a response stops being generated once the client disconnects
+
+    :param MockFixture mocker: Mocking fixture
+    :raises: AssertionError
+    """
+
+    scope = {'type': 'http', 'method': 'GET', 'path': '/', 'query_string': b'', 'headers': []}
+    generated = []
+
+    def wsgi_app(_environ: dict, start_response) -> Iterator[bytes]:
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+
+        for _ in range(1000):
+            generated.append(1)
+            yield b'chunk'
+
+    async def receive() -> dict:
+        return {'type': 'http.disconnect'}
+
+    async def send(message: dict):
+        if message['type'] == 'http.response.body':
+            raise ConnectionResetError("Client disconnected")
+
+    mocker.patch.object(application, 'wsgi_app', wsgi_app)
+
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(application(scope, receive, send))
+
+    assert len(generated) <= STREAM_WINDOW + 2
+
+
+@pytest.mark.asgi
+def test_asgi_slow_clients():
+    """Test to ensure clients slow to read their response don't hold up other requests
+
+    :raises: AssertionError
+    """
+
+    workers = 2
+
+    def wsgi_app(environ: dict, start_response) -> Iterator[bytes]:
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return iter([b'small']) if environ['PATH_INFO'] == '/small' else (b'chunk' for _ in range(100))
+
+    asgi = AsgiApplication(wsgi_app, workers)
+
+    async def fetch(path: str, reading: asyncio.Event) -> bytes:
+        scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'', 'headers': []}
+        chunks = []
+
+        async def receive() -> dict:
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message: dict):
+            if message['type'] == 'http.response.body':
+                await reading.wait()
+                chunks.append(message['body'])
+
+        await asgi(scope, receive, send)
+        return b''.join(chunks)
+
+    async def requests() -> bytes:
+        reading = asyncio.Event()
+        slow = [asyncio.ensure_future(fetch('/slow', reading)) for _ in range(workers + 1)]
+
+        # Give the slow requests time to fill their stream window
+        await asyncio.sleep(0.2)
+        ready = asyncio.Event()
+        ready.set()
+
+        try:
+            return await asyncio.wait_for(fetch('/small', ready), 2)
+
+        finally:
+            reading.set()
+            assert all(body == b'chunk' * 100 for body in await asyncio.gather(*slow))
+
+    try:
+        assert asyncio.run(requests()) == b'small'
+
+    finally:
+        asgi.executor.shutdown()
@@ -4,8 +4,10 @@
 
 """
 
+import re
 from flask import url_for
 from eve import Eve
+import pytest
 
 
 def test_nan_conversion(client: Eve, sample_schema: dict):
@@ -26,3 +28,98 @@ def test_nan_conversion(client: Eve, sample_schema: dict):
     assert res.status_code == 200
     assert res.mimetype == 'application/json'
     assert b"NaN" not in res.data
+
+
+@pytest.mark.parametrize('percent_empty, data_type', (
+        (0, 'word'),
+        (1, 'word'),
+        (0, 'random_int'),
+        (1, 'random_int')
+))
+def test_percent_empty_bounds(client: Eve, sample_schema: dict, percent_empty: float, data_type: str):
+    """Test to ensure percent_empty of 0 never and 1 always returns empty values
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param float percent_empty: Likeliness a value is empty
+    :param str data_type: Provider type
+    :raises: AssertionError
+    """
+
+    sample_schema["file_format"] = "json"
+    sample_schema["num_rows"] = 100
+    sample_schema["columns"][0]["percent_empty"] = percent_empty
+    sample_schema["columns"][0]["type"] = data_type
+    del sample_schema["columns"][0]["args"]
+
+    res = client.post(url_for('custom_schema'), json=sample_schema, headers={'Content-Type': "application/json"})
+
+    assert res.status_code == 200
+    assert len(res.json) == 100
+    assert all([(row['foo'] is None) == bool(percent_empty) for row in res.json])
+
+
+def test_percent_empty_seeded(client: Eve, sample_schema: dict):
+    """Test to ensure empty rows are reproducible with a seed
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["file_format"] = "json"
+    sample_schema["num_rows"] = 100
+    sample_schema["columns"][0]["percent_empty"] = 0.8
+    sample_schema["columns"][0]["type"] = "word"
+    del sample_schema["columns"][0]["args"]
+
+    results = [client.post(url_for('custom_schema', seed=7), json=sample_schema).json for _ in range(2)]
+
+    assert results[0] == results[1]
+    assert 0 < sum([row['foo'] is None for row in results[0]]) < 100
+
+
+@pytest.mark.parametrize('column, pattern', (
+        ({"type": "date_time"}, r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}$'),
+        ({"type": "date_time", "format": "%m/%d/%Y"}, r'^\d{2}/\d{2}/\d{4}$'),
+        ({"type": "date_object", "percent_empty": 0.5}, r'^\d{4}-\d{2}-\d{2}$'),
+        ({"type": "time_object", "format": "%H%M"}, r'^\d{4}$'),
+        ({"type": "pydecimal", "args": {"left_digits": 2, "right_digits": 2}}, r'^-?\d{1,2}\.\d{1,2}$')
+))
+def test_column_conversion(client: Eve, sample_schema: dict, column: dict, pattern: str):
+    """Test to ensure values that aren't JSON serializable are converted
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param dict column: Column definition
+    :param str pattern: Expected pattern of converted values
+    :raises: AssertionError
+    """
+
+    sample_schema["file_format"] = "json"
+    sample_schema["num_rows"] = 20
+    sample_schema["columns"][0] = dict(column, name="foo")
+
+    res = client.post(url_for('custom_schema'), json=sample_schema)
+
+    assert res.status_code == 200
+    assert all(re.match(pattern, str(row['foo'])) for row in res.json if row['foo'] is not None)
+
+
+def test_mixed_conversion(client: Eve, sample_schema: dict):
+    """Test to ensure columns with values of different types are converted value by value
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["file_format"] = "json"
+    sample_schema["num_rows"] = 20
+    sample_schema["columns"][0]["type"] = "pystruct"
+    sample_schema["columns"][0]["args"] = {"count": 2}
+
+    res = client.post(url_for('custom_schema'), json=sample_schema)
+
+    assert res.status_code == 200
+    assert all(isinstance(row['foo'], list) for row in res.json)
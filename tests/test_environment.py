@@ -4,9 +4,16 @@
 
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import gzip
 from flask import url_for
 from eve import Eve
 import pytest
+from pytest_mock.plugin import MockFixture
+from mockerena.generate import POOL_CACHE
+from mockerena.app import SCHEMA_CACHE, VALIDATION_CACHE
+from mockerena.cache import DiskLRUCache, TTLCache
+from mockerena.output_cache import RESPONSE_CACHE
 
 
 @pytest.mark.environment
@@ -25,3 +32,375 @@ def test_environment(client: Eve):
     assert data['os']
     assert data['application']
     assert data['settings']
+    assert data['cache']
+
+
+@pytest.mark.environment
+def test_environment_plan_cache(client: Eve, sample_schema: dict):
+    """Test that repeated generation of a schema reuses its cached plan
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["columns"][0]["args"]["elements"] = ["plan cache"]
+
+    before = client.get(url_for('environment')).json['cache']['plans']
+
+    for _ in range(2):
+        res = client.post(url_for('custom_schema'), json=sample_schema, headers={'Content-Type': "application/json"})
+        assert res.status_code == 200
+
+    after = client.get(url_for('environment')).json['cache']['plans']
+    assert after['misses'] == before['misses'] + 1
+    assert after['hits'] == before['hits'] + 1
+
+
+@pytest.mark.environment
+def test_environment_function_cache(client: Eve, sample_schema: dict):
+    """Test that identical functions are only compiled once across schemas
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["columns"][0]["function"] = "this + 'function cache'"
+
+    before = client.get(url_for('environment')).json['cache']['functions']
+
+    for elements in (["foo"], ["bar"]):
+        sample_schema["columns"][0]["args"]["elements"] = elements
+        res = client.post(url_for('custom_schema'), json=sample_schema, headers={'Content-Type': "application/json"})
+        assert res.status_code == 200
+
+    after = client.get(url_for('environment')).json['cache']['functions']
+    assert after['misses'] == before['misses'] + 1
+    assert after['hits'] == before['hits'] + 1
+
+
+@pytest.mark.pool
+@pytest.mark.environment
+def test_environment_pool_cache(client: Eve, sample_schema: dict, mocker: MockFixture):
+    """Test that value pools are reused and evicted once they exceed their memory budget
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param MockFixture mocker: Mocking fixture
+    :raises: AssertionError
+    """
+
+    mocker.patch.object(POOL_CACHE, 'maxbytes', 10000)
+    POOL_CACHE.clear()
+
+    for word in ("foo", "foo", "bar"):
+        sample_schema["columns"][0].update(type="word", args={"ext_word_list": [word]}, pool_size=100)
+        res = client.post(url_for('custom_schema'), json=sample_schema)
+        assert res.status_code == 200
+
+    # Only one pool of 100 words fits into the budget, so the "foo" pool is evicted for the "bar" pool
+    cache = client.get(url_for('environment')).json['cache']['pools']
+    assert cache['hits'] == 1
+    assert cache['misses'] == 2
+    assert cache['size'] == 1
+    assert 0 < cache['bytes'] <= cache['maxbytes']
+
+
+@pytest.mark.pool
+@pytest.mark.environment
+def test_environment_pool_cache_oversized(client: Eve, sample_schema: dict, mocker: MockFixture):
+    """Test that a pool too large for its memory budget is generated once per request rather than once per block
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param MockFixture mocker: Mocking fixture
+    :raises: AssertionError
+    """
+
+    mocker.patch.object(POOL_CACHE, 'maxbytes', 100)
+    POOL_CACHE.clear()
+
+    sample_schema["num_rows"] = 3000
+    sample_schema["columns"][0].update(type="word", args={"ext_word_list": ["foo"]}, pool_size=100)
+    res = client.post(url_for('custom_schema'), json=sample_schema)
+    assert res.status_code == 200
+
+    cache = client.get(url_for('environment')).json['cache']['pools']
+    assert cache['misses'] == 1
+    assert cache['size'] == 0
+
+
+@pytest.mark.seed
+@pytest.mark.environment
+@pytest.mark.parametrize('shard_size', (7, 100000))
+def test_environment_response_cache(client: Eve, sample_schema: dict, mocker: MockFixture, shard_size: int):
+    """Test that seeded responses, streamed or not, are cached and unseeded responses aren't
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param MockFixture mocker: Mocking fixture
+    :param int shard_size: Rows per streamed chunk
+    :raises: AssertionError
+    """
+
+    mocker.patch.object(RESPONSE_CACHE, 'maxbytes', 100000)
+    mocker.patch('mockerena.generate.BLOCK_SIZE', 5)
+    mocker.patch('mockerena.generate.SHARD_SIZE', shard_size)
+    RESPONSE_CACHE.clear()
+
+    sample_schema["num_rows"] = 50
+    sample_schema["file_format"] = "json"
+    sample_schema["columns"][0].update(type="name", args={})
+
+    for _ in range(2):
+        assert client.post(url_for('custom_schema'), json=sample_schema).status_code == 200
+
+    assert client.get(url_for('environment')).json['cache']['responses']['size'] == 0
+
+    # Streamed responses are cached once their body has been read
+    responses = []
+
+    for _ in range(2):
+        responses.append(client.post(url_for('custom_schema', seed=3), json=sample_schema))
+        assert len(responses[-1].json) == 50
+
+    assert responses[0].data == responses[1].data
+    assert responses[0].headers['Content-Type'] == responses[1].headers['Content-Type']
+
+    cache = client.get(url_for('environment')).json['cache']['responses']
+    assert cache['hits'] == 1
+    assert cache['misses'] == 1
+    assert cache['bytes'] == len(responses[0].data)
+
+    # Different query parameters are cached separately
+    assert client.post(url_for('custom_schema', seed=3, num_rows=10), json=sample_schema).json != responses[0].json
+    assert client.get(url_for('environment')).json['cache']['responses']['size'] == 2
+
+
+@pytest.mark.seed
+@pytest.mark.environment
+def test_environment_response_budget(client: Eve, sample_schema: dict, mocker: MockFixture):
+    """Test that responses larger than the response cache's budget aren't cached
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param MockFixture mocker: Mocking fixture
+    :raises: AssertionError
+    """
+
+    mocker.patch.object(RESPONSE_CACHE, 'maxbytes', 100)
+    mocker.patch('mockerena.generate.BLOCK_SIZE', 5)
+    mocker.patch('mockerena.generate.SHARD_SIZE', 7)
+    RESPONSE_CACHE.clear()
+
+    sample_schema["num_rows"] = 50
+
+    for _ in range(2):
+        assert client.post(url_for('custom_schema', seed=3), json=sample_schema).status_code == 200
+
+    cache = client.get(url_for('environment')).json['cache']['responses']
+    assert cache['hits'] == 0
+    assert cache['size'] == 0
+
+
+@pytest.mark.seed
+@pytest.mark.environment
+@pytest.mark.parametrize('shard_size', (7, 100000))
+def test_environment_disk_cache(client: Eve, sample_schema: dict, mocker: MockFixture, tmp_path, shard_size: int):
+    """Test that large seeded responses are cached on disk and sent from their files, gzipped if accepted
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param MockFixture mocker: Mocking fixture
+    :param tmp_path: Temporary directory
+    :param int shard_size: Rows per streamed chunk
+    :raises: AssertionError
+    """
+
+    disk_cache = DiskLRUCache(str(tmp_path), 100000)
+    mocker.patch.object(RESPONSE_CACHE, 'maxbytes', 100000)
+    mocker.patch('mockerena.output_cache.DISK_CACHE', disk_cache)
+    mocker.patch('mockerena.output_cache.DISK_CACHE_THRESHOLD', 100)
+    mocker.patch('mockerena.output_cache.DISK_CACHE_GZIP', True)
+    mocker.patch('mockerena.generate.BLOCK_SIZE', 5)
+    mocker.patch('mockerena.generate.SHARD_SIZE', shard_size)
+    RESPONSE_CACHE.clear()
+
+    sample_schema["num_rows"] = 50
+    sample_schema["columns"][0].update(type="name", args={})
+
+    expected = client.post(url_for('custom_schema', seed=3), json=sample_schema).data
+    assert disk_cache.stats()['size'] == 1
+    assert RESPONSE_CACHE.stats()['size'] == 0
+
+    res = client.post(url_for('custom_schema', seed=3), json=sample_schema)
+    assert res.data == expected
+    assert res.content_length == len(expected)
+    assert res.mimetype == 'text/csv'
+
+    res = client.post(url_for('custom_schema', seed=3), json=sample_schema, headers={'Accept-Encoding': 'gzip'})
+    assert res.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(res.data) == expected
+
+    assert disk_cache.stats()['hits'] == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        f'{name}{suffix}' for name in disk_cache._entries for suffix in ('', '.gz', '.json')  # pylint: disable=W0212
+    )
+
+    # Files written by another process are picked up on start up
+    assert DiskLRUCache(str(tmp_path), 100000).stats()['bytes'] == disk_cache.stats()['bytes']
+
+
+@pytest.mark.seed
+@pytest.mark.environment
+def test_environment_response_key(client: Eve, sample_schema: dict, mocker: MockFixture):
+    """Test that cached responses aren't reused once BLOCK_SIZE changes the seeded output
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param MockFixture mocker: Mocking fixture
+    :raises: AssertionError
+    """
+
+    mocker.patch.object(RESPONSE_CACHE, 'maxbytes', 100000)
+    RESPONSE_CACHE.clear()
+
+    sample_schema["num_rows"] = 50
+    sample_schema["columns"][0].update(type="name", args={})
+
+    res = client.post(url_for('custom_schema', seed=3), json=sample_schema)
+
+    mocker.patch('mockerena.generate.BLOCK_SIZE', 5)
+    mocker.patch('mockerena.output_cache.BLOCK_SIZE', 5)
+    other = client.post(url_for('custom_schema', seed=3), json=sample_schema)
+
+    assert other.headers['ETag'] != res.headers['ETag']
+    assert other.data != res.data
+    assert RESPONSE_CACHE.stats()['hits'] == 0
+
+
+@pytest.mark.environment
+def test_environment_disk_cache_eviction(tmp_path):
+    """Test that the disk cache evicts the least recently used files once it exceeds its budget
+
+    :param tmp_path: Temporary directory
+    :raises: AssertionError
+    """
+
+    disk_cache = DiskLRUCache(str(tmp_path), 25)
+
+    for key in ('a', 'b', 'c'):
+        disk_cache.temp_path(key)
+        (tmp_path / 'data').write_bytes(b'0123456789')
+        disk_cache.set(key, {'key': key}, {'': str(tmp_path / 'data')})
+        disk_cache.get('a')
+
+    assert 'a' in disk_cache and 'b' not in disk_cache and 'c' in disk_cache
+    assert disk_cache.get('a') == {'key': 'a', 'files': {'': 10}}
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['a', 'a.json', 'c', 'c.json']
+    assert disk_cache.stats()['bytes'] == 20
+
+    # Entries larger than the budget aren't cached
+    (tmp_path / 'data').write_bytes(b'0' * 30)
+    disk_cache.set('d', {}, {'': str(tmp_path / 'data')})
+    assert 'd' not in disk_cache and not (tmp_path / 'data').exists()
+
+
+@pytest.mark.environment
+def test_environment_schema_cache(client: Eve):
+    """Test that stored schemas are cached and dropped from the cache once they're updated
+
+    :param Eve client: Mockerena app instance
+    :raises: AssertionError
+    """
+
+    SCHEMA_CACHE.clear()
+
+    for _ in range(2):
+        assert client.get(url_for('generate', schema_id='mock_example')).status_code == 200
+
+    cache = client.get(url_for('environment')).json['cache']['schemas']
+    assert cache['hits'] == 1
+    assert cache['misses'] == 1
+
+    schema = client.get(url_for('schema|item_lookup', _id='mock_example')).json
+    res = client.patch(url_for('schema|item_lookup', _id=schema['_id']), json={'num_rows': 3},
+                       headers={'If-Match': schema['_etag']})
+    assert res.status_code == 200
+
+    res = client.get(url_for('generate', schema_id=schema['_id']))
+    assert res.get_data().decode('utf-8').count('\n') == 4  # Includes header (+1)
+
+
+@pytest.mark.environment
+def test_environment_schema_cache_ttl(mocker: MockFixture):
+    """Test that cached values expire once they're older than the cache's TTL
+
+    :param MockFixture mocker: Mocking fixture
+    :raises: AssertionError
+    """
+
+    monotonic = mocker.patch('mockerena.cache.time.monotonic', return_value=100)
+    cache = TTLCache(maxsize=2, ttl=10)
+
+    cache.set('a', 1)
+    cache.set('b', 2)
+    monotonic.return_value = 105
+    cache.set('c', 3)
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+
+    monotonic.return_value = 110
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    assert cache.stats() == {'hits': 2, 'misses': 2, 'size': 1, 'maxsize': 2, 'ttl': 10}
+
+
+@pytest.mark.schema
+@pytest.mark.environment
+def test_environment_validation_cache(client: Eve, sample_schema: dict):
+    """Test that posted schemas are only validated once and invalid schemas are always rejected
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    VALIDATION_CACHE.clear()
+    sample_schema["columns"][0]["args"]["elements"] = ["validation cache"]
+
+    for _ in range(2):
+        assert client.post(url_for('custom_schema'), json=sample_schema).status_code == 200
+
+    sample_schema["num_rows"] = -1
+
+    for _ in range(2):
+        res = client.post(url_for('custom_schema'), json=sample_schema)
+        assert res.status_code == 422
+        assert res.json["_issues"] == {"num_rows": ["min value is 1"]}
+
+    cache = client.get(url_for('environment')).json['cache']['validations']
+    assert cache['hits'] == 1
+    assert cache['misses'] == 3
+    assert cache['size'] == 1
+
+
+@pytest.mark.schema
+@pytest.mark.environment
+def test_environment_validation_threads(app: Eve, sample_schema: dict):
+    """Test that concurrent requests validating different schemas don't share validation results
+
+    :param Eve app: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    VALIDATION_CACHE.clear()
+    schemas = [dict(sample_schema, num_rows=rows) for rows in range(-20, 20)] * 2
+
+    def validate(schema: dict) -> int:
+        return app.test_client().post('/api/schema/generate', json=schema).status_code
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(validate, schemas)) == [200 if schema["num_rows"] > 0 else 422 for schema in schemas]
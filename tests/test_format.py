@@ -9,6 +9,7 @@ import json
 from flask import url_for
 from eve import Eve
 import pytest
+from pytest_mock.plugin import MockFixture
 from mockerena.app import generate_and_format
 from mockerena.format import generate_xml_template
 
@@ -175,3 +176,92 @@ def test_generate_and_format_invalid():
 
     assert status_code == 422
     assert json.loads(res) == error
+
+
+@pytest.mark.file_format
+@pytest.mark.parametrize('file_format', ('csv', 'json', 'sql', 'tsv'))
+def test_streamed_output(client: Eve, sample_schema: dict, mocker: MockFixture, file_format: str):
+    """Test to ensure output streamed in chunks is the same as output generated all at once
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param MockFixture mocker: Mocking fixture
+    :param str file_format: File format
+    :raises: AssertionError
+    """
+
+    sample_schema["num_rows"] = 20
+    sample_schema["file_format"] = file_format
+    sample_schema["columns"][0]["type"] = "word"
+    sample_schema["columns"][0]["args"] = {}
+    sample_schema["columns"][0]["function"] = "upper(this)"
+    sample_schema["columns"][1]["type"] = "random_int"
+    sample_schema["columns"][1]["args"] = {}
+
+    mocker.patch('mockerena.generate.BLOCK_SIZE', 5)
+    mocker.patch('mockerena.generate.SHARD_SIZE', 7)
+    res = client.post(url_for('custom_schema', seed=1), json=sample_schema)
+
+    mocker.patch('mockerena.format.STREAMING_FORMATS', ())
+    expected = client.post(url_for('custom_schema', seed=1), json=sample_schema)
+
+    assert res.status_code == 200
+    assert 'Content-Length' not in res.headers and 'Content-Length' in expected.headers
+    assert res.get_data() == expected.get_data()
+
+
+@pytest.mark.file_format
+@pytest.mark.parametrize('file_format', ('csv', 'json', 'sql', 'tsv'))
+def test_unstreamed_output(client: Eve, sample_schema: dict, file_format: str):
+    """Test to ensure output fitting in a single shard is sent whole, with a Content-Length
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param str file_format: File format
+    :raises: AssertionError
+    """
+
+    sample_schema["num_rows"] = 20
+    sample_schema["file_format"] = file_format
+
+    res = client.post(url_for('custom_schema'), json=sample_schema)
+
+    assert res.status_code == 200
+    assert int(res.headers['Content-Length']) == len(res.get_data())
+
+
+@pytest.mark.file_format
+def test_unstreamed_output_invalid(client: Eve, sample_schema: dict):
+    """Test to ensure errors in output fitting in a single shard return a 400
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["num_rows"] = 20
+    sample_schema["columns"][0]["function"] = "this / 0"
+
+    res = client.post(url_for('custom_schema'), json=sample_schema)
+
+    assert res.status_code == 400
+
+
+@pytest.mark.file_format
+def test_streamed_output_invalid(client: Eve, sample_schema: dict, mocker: MockFixture):
+    """Test to ensure errors in the first chunk are reported before output is streamed
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param MockFixture mocker: Mocking fixture
+    :raises: AssertionError
+    """
+
+    sample_schema["num_rows"] = 20
+    sample_schema["columns"][0]["function"] = "this / 0"
+
+    mocker.patch('mockerena.generate.BLOCK_SIZE', 5)
+    mocker.patch('mockerena.generate.SHARD_SIZE', 7)
+    res = client.post(url_for('custom_schema'), json=sample_schema)
+
+    assert res.status_code == 400
@@ -702,3 +702,59 @@ def test_invalid_function(client: Eve, sample_schema: dict):
     res = client.post(url_for('custom_schema'), json=sample_schema, headers={'Content-Type': "application/json"})
     assert res.status_code == 400
     assert res.mimetype == 'application/json'
+
+
+@pytest.mark.function
+def test_function_mixed_evaluation(client: Eve, sample_schema: dict):
+    """Test to ensure column-wise and row-wise functions give the same results together
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["num_rows"] = 50
+    sample_schema["file_format"] = "json"
+    sample_schema["columns"][0]["args"] = {"elements": ["hello"]}
+    sample_schema["columns"][0]["percent_empty"] = 0.5
+    sample_schema["columns"][1]["args"] = {"elements": [3]}
+    sample_schema["columns"][1]["function"] = "this * 100 + -this"
+    sample_schema["columns"].append({
+        "name": "baz",
+        "type": "empty",
+        "function": "concat(upper(field['foo']), ' ', str(field['bar'])) if field['foo'] else 'EMPTY'"
+    })
+    sample_schema["columns"].append({
+        "name": "qux",
+        "type": "empty",
+        "function": "round(field['bar'] / 2, 1)"
+    })
+
+    res = client.post(url_for('custom_schema'), json=sample_schema, headers={'Content-Type': "application/json"})
+    assert res.status_code == 200
+    assert res.mimetype == 'application/json'
+    assert all([row['bar'] == 297 for row in res.json])
+    assert all([row['baz'] == ('HELLO 297' if row['foo'] else 'EMPTY') for row in res.json])
+    assert all([row['qux'] == 148.5 for row in res.json])
+
+
+@pytest.mark.function
+def test_function_dependencies(client: Eve, sample_schema: dict):
+    """Test to ensure functions reading other function columns see their results, regardless of column order
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["num_rows"] = 5
+    sample_schema["file_format"] = "json"
+    sample_schema["columns"][0]["args"] = {"elements": ["hello"]}
+    sample_schema["columns"][0]["function"] = "concat(field['bar'], '.')"
+    sample_schema["columns"][1]["args"] = {"elements": ["world"]}
+    sample_schema["columns"][1]["function"] = "upper(this) if isinstance(this, str) else this"
+
+    res = client.post(url_for('custom_schema'), json=sample_schema, headers={'Content-Type': "application/json"})
+    assert res.status_code == 200
+    assert res.mimetype == 'application/json'
+    assert all([row['foo'] == 'WORLD.' and row['bar'] == 'WORLD' for row in res.json])
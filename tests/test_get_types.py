@@ -22,3 +22,48 @@ def test_get_types(client: Eve):
 
     assert res.status_code == 200
     assert res.mimetype == 'application/json'
+
+
+@pytest.mark.params
+@pytest.mark.get_types
+def test_get_types_etag(client: Eve):
+    """Test to ensure types are the same on every request and aren't sent again to clients that have them
+
+    :param Eve client: Mockerena app instance
+    :raises: AssertionError
+    """
+
+    res = client.get(url_for('get_types'))
+    etag = res.headers['ETag']
+
+    assert etag
+    assert client.get(url_for('get_types')).data == res.data
+
+    res = client.get(url_for('get_types'), headers={'If-None-Match': etag})
+
+    assert res.status_code == 304
+    assert res.headers['ETag'] == etag
+    assert not res.data
+
+
+@pytest.mark.params
+@pytest.mark.get_types
+def test_get_types_module(client: Eve):
+    """Test to ensure types can be filtered by module
+
+    :param Eve client: Mockerena app instance
+    :raises: AssertionError
+    """
+
+    res = client.get(url_for('get_types', module='person'))
+    types = res.json
+
+    assert res.status_code == 200
+    assert 'first_name' in types
+    assert all(provider_type['module'] == 'person' for provider_type in types.values())
+    assert res.headers['ETag'] != client.get(url_for('get_types')).headers['ETag']
+
+    res = client.get(url_for('get_types', module='unknown'))
+
+    assert res.status_code == 200
+    assert res.json == {}
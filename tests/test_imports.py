@@ -0,0 +1,65 @@
+"""test_imports
+
+.. codeauthor:: John Lane <john.lane93@gmail.com>
+
+"""
+
+import json
+import os
+import subprocess
+import sys
+from eve import Eve
+from flask import url_for
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def imported_modules(module: str) -> set:
+    """Returns the modules loaded by importing a module in a new interpreter
+
+    :param str module: Module name
+    :return: Names of the loaded modules
+    :rtype: set
+    """
+
+    code = f"import json, sys, {module}; print(json.dumps(sorted(sys.modules)))"
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, stdout=subprocess.PIPE, check=True).stdout
+    return set(json.loads(output.decode().splitlines()[-1]))
+
+
+@pytest.mark.imports
+@pytest.mark.parametrize('module', ('mockerena.app', 'mockerena.asgi'))
+def test_lazy_imports(module: str):
+    """Test to ensure heavy modules aren't loaded until they're needed
+
+    :param str module: Module name
+    :raises: AssertionError
+    """
+
+    modules = imported_modules(module)
+
+    assert module in modules
+    assert 'pandas' not in modules
+    assert 'flasgger' not in modules
+    assert 'mockerena.swagger' not in modules
+
+
+@pytest.mark.imports
+def test_lazy_swagger(client: Eve):
+    """Test to ensure the API docs are available once they're requested
+
+    :param Eve client: Mockerena app instance
+    :raises: AssertionError
+    """
+
+    assert client.get('/apidocs/').status_code == 200
+
+    res = client.get('/apispec_1.json')
+    paths = res.json['paths']
+
+    assert res.status_code == 200
+    assert 'get' in paths['/api/schema/{schema_id}/generate']
+    assert 'post' in paths['/api/schema/generate']
+    assert paths['/api/types']['get']['parameters'][0]['name'] == 'module'
+    assert b'/apidocs/' in client.get(url_for('index')).data
@@ -7,6 +7,8 @@
 from eve import Eve
 from flask import url_for
 import pytest
+from pytest_mock.plugin import MockFixture
+import mockerena.app
 from mockerena.settings import DEFAULT_SIZE
 
 
@@ -189,3 +191,111 @@ def test_invalid_exclude_null(client: Eve, sample_schema: dict):
     assert res.status_code == 200
     assert res.mimetype == 'application/json'
     assert 'foo' in res.json[0]
+
+
+@pytest.mark.params
+@pytest.mark.pagination
+@pytest.mark.parametrize('offset,limit', (
+        (0, 5),
+        (3, 11),
+        (7, 7),
+        (13, 100),
+        (99, 1),
+        (40, None),
+        (100, 5)
+))
+def test_offset_limit(client: Eve, sample_schema: dict, mocker: MockFixture, offset: int, limit: int):
+    """Test to ensure a seeded page of rows is the same as the slice of the whole data set
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param MockFixture mocker: Mocking fixture
+    :param int offset: First row
+    :param int limit: Maximum number of rows
+    :raises: AssertionError
+    """
+
+    sample_schema["num_rows"] = 100
+    sample_schema["file_format"] = "json"
+    sample_schema["columns"][0].update(type="random_int", args={"min": 1, "max": 200}, unique=True)
+    sample_schema["columns"][1].update(type="word", args={}, percent_empty=0.3)
+    sample_schema["columns"][1]["function"] = "upper(this) if this else this"
+    sample_schema["columns"].append({"name": "baz", "type": "random_int", "function": "this + fake.random_int()"})
+
+    mocker.patch('mockerena.generate.BLOCK_SIZE', 7)
+    mocker.patch('mockerena.generate.SHARD_SIZE', 20)
+
+    expected = client.post(url_for('custom_schema', seed=1), json=sample_schema).json
+    query_string = {'seed': 1, 'offset': offset} if limit is None else {'seed': 1, 'offset': offset, 'limit': limit}
+    res = client.post(url_for('custom_schema'), json=sample_schema, query_string=query_string)
+
+    assert res.status_code == 200
+    assert res.json == expected[offset:None if limit is None else offset + limit]
+
+
+@pytest.mark.params
+@pytest.mark.pagination
+@pytest.mark.parametrize('param', ('offset', 'limit'))
+def test_invalid_offset_limit(client: Eve, sample_schema: dict, param: str):
+    """Test to ensure invalid offsets and limits are ignored
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param str param: Parameter name
+    :raises: AssertionError
+    """
+
+    sample_schema["file_format"] = "json"
+
+    for value in ('a', -10):
+        res = client.post(url_for('custom_schema'), json=sample_schema, query_string={param: value})
+        assert res.status_code == 200
+        assert len(res.json) == sample_schema["num_rows"]
+
+
+@pytest.mark.params
+@pytest.mark.etag
+def test_etag(client: Eve, sample_schema: dict):
+    """Test to ensure seeded responses have an ETag that changes with the schema and query parameters
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    etag = client.post(url_for('custom_schema', seed=1), json=sample_schema).headers['ETag']
+
+    assert client.post(url_for('custom_schema', seed=1), json=sample_schema).headers['ETag'] == etag
+    assert client.post(url_for('custom_schema', seed=2), json=sample_schema).headers['ETag'] != etag
+    assert client.post(url_for('custom_schema', seed=1, num_rows=5), json=sample_schema).headers['ETag'] != etag
+    assert 'ETag' not in client.post(url_for('custom_schema'), json=sample_schema).headers
+
+    sample_schema["num_rows"] = 5
+    assert client.post(url_for('custom_schema', seed=1), json=sample_schema).headers['ETag'] != etag
+
+
+@pytest.mark.params
+@pytest.mark.etag
+def test_etag_not_modified(client: Eve, mocker: MockFixture):
+    """Test to ensure requests with a matching If-None-Match get a 304 without generating data
+
+    :param Eve client: Mockerena app instance
+    :param MockFixture mocker: Mocking fixture
+    :raises: AssertionError
+    """
+
+    res = client.get(url_for('generate', schema_id='mock_example', seed=1))
+    assert res.status_code == 200
+    assert res.headers['ETag']
+
+    generate_chunks = mocker.spy(mockerena.app, 'generate_chunks')
+    url = url_for('generate', schema_id='mock_example', seed=1)
+
+    res = client.get(url, headers={'If-None-Match': res.headers['ETag']})
+    assert res.status_code == 304
+    assert not res.data
+    generate_chunks.assert_not_called()
+
+    res = client.get(url, headers={'If-None-Match': '"something-else"'})
+    assert res.status_code == 200
+    generate_chunks.assert_called_once()
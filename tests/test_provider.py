@@ -4,10 +4,13 @@
 
 """
 
+import re
 from typing import Union
 from eve import Eve
 from flask import url_for
 import pytest
+from pytest_mock.plugin import MockFixture
+from mockerena.models.schema import MAX_POOL_SIZE
 
 
 @pytest.mark.price
@@ -54,6 +57,26 @@ def test_provider_price_invalid(client: Eve, sample_schema: dict, min_: Union[in
     assert isinstance(res.json[0]['foo'], float)
 
 
+@pytest.mark.price
+@pytest.mark.provider
+def test_provider_price_swapped(client: Eve, sample_schema: dict):
+    """Test to ensure price accepts a minimum larger than its maximum, like the price provider
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["file_format"] = "json"
+    sample_schema["num_rows"] = 50
+    sample_schema["columns"][0]["type"] = "price"
+    sample_schema["columns"][0]["args"] = {"minimum": 10, "maximum": 5}
+
+    res = client.post(url_for('custom_schema'), json=sample_schema, headers={'Content-Type': "application/json"})
+    assert res.status_code == 200
+    assert all(5 <= row['foo'] <= 10 for row in res.json)
+
+
 @pytest.mark.price
 @pytest.mark.provider
 def test_provider_price_negative(client: Eve, sample_schema: dict):
@@ -184,3 +207,363 @@ def test_provider_empty(client: Eve, sample_schema: dict):
     assert res.status_code == 200
     assert res.mimetype == 'application/json'
     assert res.json[0]['foo'] == ""
+
+
+@pytest.mark.provider
+@pytest.mark.parametrize('args, expected', (
+        ({"min": 5, "max": 10}, range(5, 11)),
+        ({"min": -9, "max": 9, "step": 3}, range(-9, 10, 3)),
+        ({"min": 1, "max": 1}, range(1, 2))
+))
+def test_provider_random_int(client: Eve, sample_schema: dict, args: dict, expected: range):
+    """Test to ensure random_int respects min, max and step
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param dict args: Provider arguments
+    :param range expected: Range of values that are allowed
+    :raises: AssertionError
+    """
+
+    sample_schema["file_format"] = "json"
+    sample_schema["num_rows"] = 100
+    sample_schema["columns"][0]["type"] = "random_int"
+    sample_schema["columns"][0]["args"] = args
+
+    res = client.post(url_for('custom_schema'), json=sample_schema, headers={'Content-Type': "application/json"})
+    assert res.status_code == 200
+    assert all([row['foo'] in expected for row in res.json])
+
+
+@pytest.mark.provider
+def test_provider_random_int_invalid(client: Eve, sample_schema: dict):
+    """Test to ensure an empty random_int range is a bad request
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["columns"][0]["type"] = "random_int"
+    sample_schema["columns"][0]["args"] = {"min": 10, "max": 1}
+
+    res = client.post(url_for('custom_schema'), json=sample_schema, headers={'Content-Type': "application/json"})
+    assert res.status_code == 400
+
+
+@pytest.mark.provider
+@pytest.mark.parametrize('args', (
+        {},
+        {"left_digits": 2, "right_digits": 2, "positive": True},
+        {"min_value": -10, "max_value": 10},
+        {"min_value": 100},
+        {"max_value": -100}
+))
+def test_provider_pyfloat(client: Eve, sample_schema: dict, args: dict):
+    """Test to ensure pyfloat respects its arguments
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param dict args: Provider arguments
+    :raises: AssertionError
+    """
+
+    sample_schema["file_format"] = "json"
+    sample_schema["num_rows"] = 100
+    sample_schema["columns"][0]["type"] = "pyfloat"
+    sample_schema["columns"][0]["args"] = args
+
+    res = client.post(url_for('custom_schema'), json=sample_schema, headers={'Content-Type': "application/json"})
+    assert res.status_code == 200
+
+    column_foo = [row['foo'] for row in res.json]
+    assert all([isinstance(value, float) for value in column_foo])
+
+    if args.get('positive'):
+        assert all([0 <= value < 100 and round(value, 2) == value for value in column_foo])
+
+    if 'max_value' in args:
+        assert all([value <= args['max_value'] for value in column_foo])
+
+    if 'min_value' in args:
+        assert all([value >= args['min_value'] for value in column_foo])
+
+
+@pytest.mark.provider
+@pytest.mark.parametrize('data_type, expected', (
+        ('pybool', (True, False)),
+        ('random_digit', range(0, 10))
+))
+def test_provider_numeric(client: Eve, sample_schema: dict, data_type: str, expected: tuple):
+    """Test to ensure argument-less numeric providers generate valid values
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param str data_type: Provider type
+    :param tuple expected: Values that are allowed
+    :raises: AssertionError
+    """
+
+    sample_schema["file_format"] = "json"
+    sample_schema["num_rows"] = 100
+    sample_schema["columns"][0]["type"] = data_type
+    sample_schema["columns"][0]["args"] = {}
+
+    res = client.post(url_for('custom_schema'), json=sample_schema, headers={'Content-Type': "application/json"})
+    assert res.status_code == 200
+    assert all([row['foo'] in expected for row in res.json])
+
+
+@pytest.mark.provider
+@pytest.mark.parametrize('count', (3, 500))
+def test_provider_zero_weight(client: Eve, sample_schema: dict, count: int):
+    """Test to ensure elements with no weight are never chosen, including for long element lists
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param int count: Number of elements
+    :raises: AssertionError
+    """
+
+    sample_schema["file_format"] = "json"
+    sample_schema["num_rows"] = 200
+    sample_schema["columns"][0]["type"] = "weighted_choice"
+    sample_schema["columns"][0]["args"] = {
+        "elements": [f"element_{i}" for i in range(count)],
+        "weights": [i % 2 for i in range(count)]
+    }
+
+    res = client.post(url_for('custom_schema'), json=sample_schema, headers={'Content-Type': "application/json"})
+    assert res.status_code == 200
+    assert all([int(row['foo'].split('_')[1]) % 2 for row in res.json])
+
+
+@pytest.mark.regex
+@pytest.mark.provider
+def test_provider_regex_limit(client: Eve, sample_schema: dict):
+    """Test to ensure unbounded regex quantifiers are capped
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["file_format"] = "json"
+    sample_schema["num_rows"] = 100
+    sample_schema["columns"][0]["type"] = "regex"
+    sample_schema["columns"][0]["args"] = {"expression": "SKU-[0-9]+"}
+
+    res = client.post(url_for('custom_schema'), json=sample_schema, headers={'Content-Type': "application/json"})
+    assert res.status_code == 200
+    assert all([re.match(r'^SKU-[0-9]{1,20}$', row['foo']) for row in res.json])
+
+
+@pytest.mark.pool
+@pytest.mark.provider
+def test_provider_pool_size(client: Eve, sample_schema: dict):
+    """Test to ensure pooled columns sample from a fixed number of values, reproducibly for a seed
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["file_format"] = "json"
+    sample_schema["num_rows"] = 200
+    sample_schema["columns"][0]["type"] = "name"
+    sample_schema["columns"][0]["args"] = {}
+    sample_schema["columns"][0]["pool_size"] = 5
+    sample_schema["columns"][1]["type"] = "date_object"
+    sample_schema["columns"][1]["args"] = {}
+    sample_schema["columns"][1]["format"] = "%Y"
+    sample_schema["columns"][1]["pool_size"] = 3
+
+    res = client.post(url_for('custom_schema', seed=1), json=sample_schema)
+    assert res.status_code == 200
+    assert 1 < len({row['foo'] for row in res.json}) <= 5
+    assert all([re.match(r'^\d{4}$', row['bar']) for row in res.json])
+    assert len({row['bar'] for row in res.json}) <= 3
+    assert client.post(url_for('custom_schema', seed=1), json=sample_schema).json == res.json
+    assert client.post(url_for('custom_schema', seed=2), json=sample_schema).json != res.json
+
+
+@pytest.mark.pool
+@pytest.mark.provider
+@pytest.mark.parametrize('pool_size', (0, MAX_POOL_SIZE + 1))
+def test_provider_pool_size_invalid(client: Eve, sample_schema: dict, pool_size: int):
+    """Test to ensure pool_size must be positive and no larger than MAX_POOL_SIZE
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param int pool_size: Invalid pool size
+    :raises: AssertionError
+    """
+
+    sample_schema["columns"][0]["pool_size"] = pool_size
+
+    res = client.post(url_for('custom_schema'), json=sample_schema)
+    assert res.status_code == 422
+
+
+@pytest.mark.unique
+@pytest.mark.provider
+@pytest.mark.parametrize('column', (
+        {"type": "random_int", "args": {"min": 1, "max": 100}},
+        {"type": "random_int", "args": {"min": 1, "max": 100}, "percent_empty": 0.5},
+        {"type": "word", "args": {"ext_word_list": [f"word_{i}" for i in range(100)]}},
+        {"type": "word", "args": {"ext_word_list": [f"word_{i}" for i in range(1000)]}, "pool_size": 500}
+))
+def test_provider_unique(client: Eve, sample_schema: dict, column: dict):
+    """Test to ensure unique columns never repeat a value, even when using most of the provider's values
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param dict column: Column definition
+    :raises: AssertionError
+    """
+
+    sample_schema["file_format"] = "json"
+    sample_schema["num_rows"] = 90
+    sample_schema["columns"][0] = dict(column, name="foo", unique=True)
+
+    res = client.post(url_for('custom_schema'), json=sample_schema)
+    assert res.status_code == 200
+
+    values = [row['foo'] for row in res.json if row['foo'] is not None]
+    assert values
+    assert len(values) == len(set(values))
+
+
+@pytest.mark.unique
+@pytest.mark.provider
+@pytest.mark.parametrize('workers', (0, 2))
+def test_provider_unique_sharded(client: Eve, sample_schema: dict, mocker: MockFixture, workers: int):
+    """Test to ensure unique columns don't repeat values across row shards, streamed or in a process pool
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param MockFixture mocker: Mocking fixture
+    :param int workers: Number of worker processes
+    :raises: AssertionError
+    """
+
+    sample_schema["file_format"] = "json"
+    sample_schema["num_rows"] = 2500
+    sample_schema["columns"][0].update(type="random_int", args={"min": 1, "max": 5000}, unique=True)
+    sample_schema["columns"][1].update(type="random_int", args={"min": 1, "max": 30})
+
+    mocker.patch('mockerena.generate.SHARD_SIZE', 1000)
+    expected = client.post(url_for('custom_schema', seed=1), json=sample_schema).json
+
+    mocker.patch('mockerena.parallel.PARALLEL_WORKERS', workers)
+    mocker.patch('mockerena.parallel.PARALLEL_THRESHOLD', 1)
+    res = client.post(url_for('custom_schema', seed=1), json=sample_schema)
+
+    assert res.status_code == 200
+    assert res.json == expected
+    assert len({row['foo'] for row in res.json}) == 2500
+
+
+@pytest.mark.unique
+@pytest.mark.provider
+def test_provider_unique_exhausted(client: Eve, sample_schema: dict):
+    """Test to ensure a unique column asking for more values than its provider has returns a 400
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["num_rows"] = 11
+    sample_schema["columns"][0].update(type="random_int", args={"min": 1, "max": 10}, unique=True)
+
+    res = client.post(url_for('custom_schema'), json=sample_schema)
+    assert res.status_code == 400
+    assert res.json['_error']['message'].endswith("Exception at column foo, could only generate 10 unique values")
+
+
+@pytest.mark.unique
+@pytest.mark.provider
+def test_provider_unique_exhausted_shards(client: Eve, sample_schema: dict, mocker: MockFixture):
+    """Test to ensure a unique column running out of values after the first shard of a stream still returns a 400
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param MockFixture mocker: Mocking fixture
+    :raises: AssertionError
+    """
+
+    sample_schema["file_format"] = "csv"
+    sample_schema["num_rows"] = 3000
+    sample_schema["columns"][0].update(type="random_int", args={"min": 0, "max": 1500}, unique=True)
+
+    mocker.patch('mockerena.generate.SHARD_SIZE', 1000)
+
+    res = client.post(url_for('custom_schema', seed=1), json=sample_schema)
+    assert res.status_code == 400
+    assert res.json['_error']['message'].endswith("Exception at column foo, could only generate 1501 unique values")
+
+
+@pytest.mark.locale
+@pytest.mark.provider
+def test_provider_locale(client: Eve, sample_schema: dict):
+    """Test to ensure columns use the schema's locale unless they set their own
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["file_format"] = "json"
+    sample_schema["locale"] = "ja_JP"
+    sample_schema["columns"][0]["type"] = "name"
+    sample_schema["columns"][0]["args"] = {}
+    sample_schema["columns"][1]["type"] = "name"
+    sample_schema["columns"][1]["args"] = {}
+    sample_schema["columns"][1]["locale"] = "en_US"
+
+    res = client.post(url_for('custom_schema'), json=sample_schema, headers={'Content-Type': "application/json"})
+    assert res.status_code == 200
+    assert all(not row['foo'].isascii() for row in res.json)
+    assert all(row['bar'].isascii() for row in res.json)
+
+
+@pytest.mark.locale
+@pytest.mark.provider
+def test_provider_locale_seed(client: Eve, sample_schema: dict):
+    """Test to ensure seeded requests return the same data for every locale
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["num_rows"] = 50
+    sample_schema["columns"][0]["type"] = "address"
+    sample_schema["columns"][0]["args"] = {}
+    sample_schema["columns"][0]["locale"] = "de_DE"
+    sample_schema["columns"][1]["type"] = "address"
+    sample_schema["columns"][1]["args"] = {}
+    sample_schema["columns"][1]["function"] = "this + fake.city()"
+    sample_schema["columns"][1]["locale"] = "fr_FR"
+
+    results = [client.post(url_for('custom_schema', seed=42), json=sample_schema).data for _ in range(3)]
+    assert len(set(results)) == 1
+
+
+@pytest.mark.locale
+@pytest.mark.provider
+def test_provider_locale_invalid(client: Eve, sample_schema: dict):
+    """Test to ensure unknown locales are rejected
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["columns"][0]["locale"] = "xx_XX"
+
+    res = client.post(url_for('custom_schema'), json=sample_schema, headers={'Content-Type': "application/json"})
+    assert res.status_code == 422
+    assert res.json["_status"] == "ERR"
+    assert "locale" in str(res.json["_issues"])
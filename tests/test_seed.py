@@ -4,9 +4,13 @@
 
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import random
 import pytest
 from eve import Eve
 from flask import url_for
+from pytest_mock.plugin import MockFixture
+from mockerena.generate import POOL_CACHE
 
 
 @pytest.mark.seed
@@ -51,3 +55,158 @@ def test_no_seed(client: Eve, sample_schema: dict):
 
     results = [client.post(url_for('custom_schema'), json=sample_schema).data for _ in range(iterations)]
     assert len(set(results)) == iterations
+
+
+@pytest.mark.seed
+def test_seed_parallel(client: Eve, sample_schema: dict, mocker: MockFixture):
+    """Tests seeded output is the same when columns are generated in a process pool
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param MockFixture mocker: Mocking fixture
+    :raises: AssertionError
+    """
+
+    sample_schema["num_rows"] = 50
+    sample_schema["columns"][0]["type"] = "word"
+    sample_schema["columns"][0]["args"] = {}
+    sample_schema["columns"][0]["percent_empty"] = 0.2
+    sample_schema["columns"][1]["type"] = "random_int"
+    sample_schema["columns"][1]["args"] = {}
+    sample_schema["columns"].append({"name": "baz", "type": "word", "function": "concat(this, fake.word())"})
+
+    expected = client.post(url_for('custom_schema', seed=42), json=sample_schema).data
+
+    mocker.patch('mockerena.parallel.PARALLEL_WORKERS', 2)
+    mocker.patch('mockerena.parallel.PARALLEL_THRESHOLD', 1)
+
+    assert client.post(url_for('custom_schema', seed=42), json=sample_schema).data == expected
+
+
+@pytest.mark.seed
+@pytest.mark.parametrize('workers', (0, 2, 3))
+def test_seed_sharded(client: Eve, sample_schema: dict, mocker: MockFixture, workers: int):
+    """Tests seeded output split into row shards doesn't depend on the number of workers
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param MockFixture mocker: Mocking fixture
+    :param int workers: Number of worker processes
+    :raises: AssertionError
+    """
+
+    sample_schema["num_rows"] = 2500
+    sample_schema["file_format"] = "json"
+    sample_schema["columns"][0]["type"] = "word"
+    sample_schema["columns"][0]["args"] = {}
+    sample_schema["columns"][1]["type"] = "random_int"
+    sample_schema["columns"][1]["args"] = {}
+
+    # Worker processes may have been started before settings are patched, so the block size can't change here
+    mocker.patch('mockerena.generate.SHARD_SIZE', 1000)
+    expected = client.post(url_for('custom_schema', seed=42), json=sample_schema).json
+
+    mocker.patch('mockerena.parallel.PARALLEL_WORKERS', workers)
+    mocker.patch('mockerena.parallel.PARALLEL_THRESHOLD', 1)
+
+    assert client.post(url_for('custom_schema', seed=42), json=sample_schema).json == expected
+    assert len(expected) == 2500
+
+
+@pytest.mark.seed
+def test_seed_sharded_pool(client: Eve, sample_schema: dict, mocker: MockFixture):
+    """Tests streamed shards are submitted to the pool ahead of being sent, when the whole request is large enough
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param MockFixture mocker: Mocking fixture
+    :raises: AssertionError
+    """
+
+    sample_schema["num_rows"] = 50
+    sample_schema["file_format"] = "csv"
+    sample_schema["columns"][0]["type"] = "word"
+    sample_schema["columns"][0]["args"] = {}
+    sample_schema["columns"][1]["type"] = "random_int"
+    sample_schema["columns"][1]["args"] = {}
+
+    mocker.patch('mockerena.generate.BLOCK_SIZE', 5)
+    mocker.patch('mockerena.generate.SHARD_SIZE', 10)
+    expected = client.post(url_for('custom_schema', seed=42), json=sample_schema).data
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    submit = mocker.spy(pool, 'submit')
+    get_pool = mocker.patch('mockerena.generate.get_pool', return_value=pool)
+    mocker.patch('mockerena.parallel.PARALLEL_WORKERS', 4)
+
+    with client.post(url_for('custom_schema', seed=42), json=sample_schema) as res:
+        chunks = iter(res.response)
+        next(chunks)
+        next(chunks)
+
+        # Two columns on four workers: the first shard and the two after it
+        assert submit.call_count == 2 * 3
+
+        assert b''.join(chunks) and res.status_code == 200
+
+    get_pool.assert_called_once_with(50 * 2)
+    assert submit.call_count == 2 * 5
+    assert client.post(url_for('custom_schema', seed=42), json=sample_schema).data == expected
+    pool.shutdown()
+
+
+@pytest.mark.seed
+@pytest.mark.regex
+def test_seed_regex(client: Eve, sample_schema: dict, mocker: MockFixture):
+    """Tests seeded regex columns don't depend on the global random state
+
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :param MockFixture mocker: Mocking fixture
+    :raises: AssertionError
+    """
+
+    sample_schema["num_rows"] = 50
+    sample_schema["file_format"] = "json"
+    sample_schema["columns"][0]["type"] = "regex"
+    sample_schema["columns"][0]["args"] = {"expression": r"[A-Z]{3}-\d{2,6}(foo|bar)?\w*"}
+    sample_schema["columns"][1]["type"] = "regex"
+    sample_schema["columns"][1]["args"] = {"expression": r"[a-f0-9]{8}"}
+    sample_schema["columns"][1]["pool_size"] = 5
+
+    mocker.patch('mockerena.generate.BLOCK_SIZE', 7)
+    expected = client.post(url_for('custom_schema', seed=42), json=sample_schema).json
+
+    POOL_CACHE.clear()
+    random.seed(1)
+    assert client.post(url_for('custom_schema', seed=42), json=sample_schema).json == expected
+
+    res = client.post(url_for('custom_schema', seed=42, offset=10, limit=20), json=sample_schema)
+    assert res.json == expected[10:30]
+    assert client.post(url_for('custom_schema', seed=43), json=sample_schema).json != expected
+
+
+@pytest.mark.seed
+def test_seed_threads(app: Eve, client: Eve, sample_schema: dict):
+    """Tests concurrent seeded requests don't share random state
+
+    :param Eve app: Mockerena app
+    :param Eve client: Mockerena app instance
+    :param dict sample_schema: Sample schema data
+    :raises: AssertionError
+    """
+
+    sample_schema["num_rows"] = 200
+    sample_schema["columns"][0]["type"] = "name"
+    sample_schema["columns"][0]["args"] = {}
+    sample_schema["columns"][1]["type"] = "price"
+    sample_schema["columns"][1]["args"] = {}
+    seeds = list(range(8)) * 3
+
+    expected = [client.post(url_for('custom_schema', seed=seed), json=sample_schema).data for seed in seeds]
+
+    def generate(seed: int) -> bytes:
+        return app.test_client().post(f'/api/schema/generate?seed={seed}', json=sample_schema).data
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(generate, seeds)) == expected